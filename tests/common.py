@@ -1,9 +1,18 @@
 #!/usr/bin/env python3
 import os
+import itertools
+import json
 import uuid
 import re
-from typing import Union
-from pymisp import PyMISP, MISPEvent, ThreatLevel, Analysis, MISPAttribute
+import time
+import unittest
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Union
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pymisp import PyMISP, MISPEvent, MISPGalaxy, MISPGalaxyCluster, ThreatLevel, Analysis, MISPAttribute, MISPSighting
 from pymisp.api import get_uuid_or_id_from_abstract_misp
 
 
@@ -13,31 +22,208 @@ from pymisp.api import get_uuid_or_id_from_abstract_misp
 hosts = []
 auths_site_admin = []
 auths_org_admin = []
-i = 1
-while True:
-    host_key = f"HOST_{i}"
-    auth_site_key = f"AUTH_ADMIN_{i}"
-    auth_org_key = f"AUTH_ORG_{i}"
-    if host_key in os.environ and auth_site_key in os.environ and auth_org_key in os.environ:
-        hosts.append("http://" + os.environ[host_key])
-        auths_site_admin.append(os.environ[auth_site_key])
-        auths_org_admin.append(os.environ[auth_org_key])
-        i += 1
-    else:
+env = dict(os.environ)
+for i in itertools.count(1):
+    host = env.get(f"HOST_{i}")
+    auth_site = env.get(f"AUTH_ADMIN_{i}")
+    auth_org = env.get(f"AUTH_ORG_{i}")
+    if host is None or auth_site is None or auth_org is None:
         break
+    hosts.append("http://" + host)
+    auths_site_admin.append(auth_site)
+    auths_org_admin.append(auth_org)
+
+# Server names end with the number of the instance they point to.
+# INSTALL.sh names them 'MISP_<n>', other names fall back to the trailing digits.
+SERVER_NAME_PREFIX = 'MISP_'
+TRAILING_DIGITS = re.compile(r'(\d+)$')
+
+# Instances are reached over plain HTTP with ssl=False, silence the warning once
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+def connect(host: str, auth: str) -> PyMISP:
+    """
+    Create a PyMISP connector whose session keeps a pool of alive connections to the host.
+    Only idempotent GET/HEAD requests are retried on transient gateway errors,
+    so a POST (publish, push, mass delete...) is never sent twice.
+    """
+    pymisp = PyMISP(host, auth, ssl=False)
+    retry = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504],
+                  allowed_methods=frozenset(['GET', 'HEAD']), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=max(len(hosts), 1), pool_maxsize=32, max_retries=retry)
+    # Mounted for both schemes so the pool is kept if the instances are ever served over TLS
+    for scheme in ('http://', 'https://'):
+        pymisp._PyMISP__session.mount(scheme, adapter)
+    return pymisp
+
 
-# Create PyMISP connectors for each host/auth pair
-misps_site_admin = [PyMISP(host, auth, ssl=False) for host, auth in zip(hosts, auths_site_admin)]
-misps_org_admin = [PyMISP(host, auth, ssl=False) for host, auth in zip(hosts, auths_org_admin)]
+class LazyConnectors(Sequence):
+    """
+    Read-only list of PyMISP connectors, one per host.
+    Each connector is created on first access, as PyMISP queries the instance when constructed.
+    """
+    def __init__(self, auths):
+        self._auths = auths
+        self._connectors = [None] * len(auths)
+
+    def __len__(self):
+        return len(self._auths)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("MISP instance index out of range")
+        if self._connectors[index] is None:
+            self._connectors[index] = connect(hosts[index], self._auths[index])
+        return self._connectors[index]
+
+
+# PyMISP connectors for each host/auth pair
+misps_site_admin = LazyConnectors(auths_site_admin)
+misps_org_admin = LazyConnectors(auths_org_admin)
 print(f"Found {len(misps_site_admin)} MISP instances.")
 
+# Server lists per instance index, the tests never change the server configuration
+_servers_cache = {}
+
+
+def cached_servers(index: int):
+    """
+    Return the servers configured on the given instance, as seen by its site admin.
+    The list is fetched on first use and shared afterwards, so it must not be modified.
+    """
+    if index < 0:
+        index += len(misps_site_admin)
+    if index not in _servers_cache:
+        _servers_cache[index] = misps_site_admin[index].servers()
+    return _servers_cache[index]
+
+
+
+# Seconds to wait for data to show up on another instance after a publish, push or pull
+SYNC_TIMEOUT = 30
+# Seconds during which data that must not be synchronised is watched for on another instance
+ABSENCE_TIMEOUT = 3
+# Longest pause between two polls of wait_for
+MAX_POLL_INTERVAL = 1.0
+
+
+def wait_for(fetch, condition=bool, timeout: float = SYNC_TIMEOUT, interval: float = 0.1, backoff: float = 1.5):
+    """
+    Call fetch until condition holds on its result or timeout seconds have elapsed.
+    By default the result itself must be truthy (e.g. a non-empty search result).
+    The pause between polls starts at interval and grows by backoff, up to MAX_POLL_INTERVAL,
+    so quick operations are seen early without hammering the instance during slow ones.
+    Returns the last fetched result, so callers can assert on it.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        result = fetch()
+        remaining = deadline - time.monotonic()
+        if condition(result) or remaining <= 0:
+            return result
+        time.sleep(min(interval, remaining))
+        interval = min(interval * backoff, MAX_POLL_INTERVAL)
+
+
+def is_found(response) -> bool:
+    """
+    Tell whether a get_* response holds the requested object rather than an error.
+    """
+    return response is not None and not (isinstance(response, dict) and "errors" in response)
+
+
+def uuid_set(objects) -> frozenset:
+    """
+    Return the UUIDs of the given pythonified MISP objects, or an empty set for an error response.
+    """
+    if not isinstance(objects, list):
+        return frozenset()
+    return frozenset(obj.uuid for obj in objects)
+
+
+def find_sighting(event_data: dict, attr_id, source: str) -> Optional[dict]:
+    """
+    Return the sighting with the given source on the attribute with the given ID of a searched event, or None.
+    The event must have been searched with include_sightings=True.
+    """
+    attr_id = str(attr_id)
+    # Attribute IDs are unique within an event, so the scan stops at the first match
+    attr = next((attr for attr in event_data.get('Attribute', []) if str(attr['id']) == attr_id), None)
+    if attr is None:
+        return None
+    return next((sighting for sighting in attr.get('Sighting', [])
+                 if sighting['source'] == source and str(sighting['attribute_id']) == attr_id), None)
 
 
-def create_event(name: str):
+def has_note(notes, uuid: str, text: str) -> bool:
+    """
+    Tell whether an analyst data index of notes holds a note with the given text on the object with the given UUID.
+    """
+    return isinstance(notes, list) and any(note['Note']['object_uuid'] == uuid and note['Note']['note'] == text for note in notes)
+
+
+def has_attribute_value(event_data: dict, value: str, deleted: bool = False) -> bool:
+    """
+    Tell whether a searched event holds an attribute with the given value, soft-deleted or not.
+    Soft-deleted attributes are only returned by searches made with deleted=True by a site admin.
+    """
+    return any(attr['value'] == value and bool(attr.get('deleted')) == deleted for attr in event_data.get('Attribute', []))
+
+
+def has_proposal_value(event_data: dict, value: str) -> bool:
+    """
+    Tell whether a searched event holds a pending proposal with the given value.
+    """
+    return any(proposal['value'] == value for proposal in event_data.get('ShadowAttribute', []))
+
+
+def has_deletion_proposal(event_data: dict, value: str) -> bool:
+    """
+    Tell whether the attribute with the given value of a searched event carries a proposal to delete it.
+    """
+    return any(attr['value'] == value and any(proposal['proposal_to_delete'] is True for proposal in attr.get('ShadowAttribute', []))
+               for attr in event_data.get('Attribute', []))
+
+
+def has_cluster_uuid(event_data: dict, cluster_uuid) -> bool:
+    """
+    Tell whether the galaxy cluster with the given UUID is attached to a searched event.
+    """
+    cluster_uuid = str(cluster_uuid)
+    return any(str(cluster['uuid']) == cluster_uuid
+               for galaxy in event_data.get('Galaxy', []) for cluster in galaxy.get('GalaxyCluster', []))
+
+
+def has_distribution(distribution: int):
+    """
+    Build a wait_for condition holding when event search results exist and all have the given distribution.
+    """
+    return lambda results: bool(results) and all(int(result['Event']['distribution']) == distribution for result in results)
+
+
+def parallel_map(func, items, max_workers: int = 16):
+    """
+    Apply func to every item concurrently and return the results in input order.
+    Meant for independent, I/O-bound PyMISP calls.
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def create_event(name: str, sightings: Iterable[MISPSighting] = ()):
     """
     Create a new MISPEvent with a unique UUID, info field, and default attributes.
     Distribution is set to 'Your organisation' (id 0), threat level is 'low', analysis is 'completed'.
-    Adds a text attribute containing the event UUID.
+    Adds a text attribute containing the event UUID, carrying the given sightings,
+    so that they are created by the same add_event request as the event.
     """
     event = MISPEvent()
     event_uuid = str(uuid.uuid4())
@@ -46,7 +232,9 @@ def create_event(name: str):
     event.distribution = 0  # Set distribution to 'Your organisation' (id 0)
     event.threat_level_id = ThreatLevel.low
     event.analysis = Analysis.completed
-    event.add_attribute('text', event_uuid)
+    attribute = event.add_attribute('text', event_uuid)
+    for sighting in sightings:
+        attribute.add_sighting(sighting)
     return event
 
 
@@ -61,106 +249,279 @@ def create_attribute(category: str, value: str):
     attribute.uuid = attribute_uuid
     return attribute
 
+
+# Authors of the test galaxy clusters, shared by every cluster and never modified
+CLUSTER_AUTHORS = ["CIRCL"]
+
+
+def create_galaxy_cluster(value: str, distribution: int, description: str):
+    """
+    Create a new MISPGalaxyCluster with a unique UUID, value, distribution and description, authored by CIRCL.
+    """
+    cluster = MISPGalaxyCluster()
+    cluster.uuid = str(uuid.uuid4())
+    cluster.value = value
+    cluster.authors = CLUSTER_AUTHORS
+    cluster.distribution = distribution
+    cluster.description = description
+    return cluster
+
+def server_number(name: str) -> Optional[int]:
+    """
+    Return the instance number a server name points to, or None if it has none.
+    """
+    if name.startswith(SERVER_NAME_PREFIX) and name[len(SERVER_NAME_PREFIX):].isdecimal():
+        return int(name[len(SERVER_NAME_PREFIX):])
+    match = TRAILING_DIGITS.search(name)
+    return int(match.group(1)) if match else None
+
 def extract_server_numbers(servers):
     """
     Extract server numbers from the server names.
     Assumes server names are in the format ending with a number (e.g., 'MISP Server X').
     Returns a list of integers.
     """
-    numbers = []
+    numbers = (server_number(server['Server']['name']) for server in servers)
+    return [number for number in numbers if number is not None]
+
+def server_number_to_id(servers):
+    """
+    Map the number at the end of each server name to the ID of that server.
+    Returns a dict {server_number: server_id}.
+    """
+    mapping = {}
     for server in servers:
-        name = server['Server']['name']
-        match = re.search(r'\d+$', name)
-        if match:
-            numbers.append(int(match.group()))
-    return numbers
+        number = server_number(server['Server']['name'])
+        if number is not None:
+            mapping[number] = server['Server']['id']
+    return mapping
 
 def get_servers_id(servers):
     """
     Extract server IDs from the server list.
     Returns a list of IDs.
     """
-    ids = []
+    return [server['Server']['id'] for server in servers]
+
+def servers_info(servers):
+    """
+    Extract both the server IDs and the server numbers from the server list, in a single pass.
+    Returns a tuple (list of IDs, list of integers), as get_servers_id and extract_server_numbers would.
+    """
+    servers_id, numbers = [], []
     for server in servers:
-        ids.append(server['Server']['id'])
-    return ids
+        servers_id.append(server['Server']['id'])
+        number = server_number(server['Server']['name'])
+        if number is not None:
+            numbers.append(number)
+    return servers_id, numbers
 
-def find_unidirectional_link():
+def iter_unidirectional_links():
     """
-    Find a source/target pair for a unidirectional link.
-    Returns (source_instance, target_instance, source_index, target_index, server_id).
+    Yield every unidirectional link between the instances.
+    Each item is (source_instance, target_instance, source_index, target_index, server_id).
     Skips bidirectional links.
+    The server lists of all instances are fetched concurrently before the first item, then cached.
     """
-    for i, source_instance in enumerate(misps_org_admin):
-        source_index = i + 1
-        # Extract server numbers from the source instance
-        source_links = extract_server_numbers(misps_site_admin[i].servers())
-
-        for target_index in source_links:
-            target_instance = misps_org_admin[target_index - 1]
-            target_links = extract_server_numbers(misps_site_admin[target_index - 1].servers())
+    server_lists = parallel_map(cached_servers, range(len(misps_site_admin)))
+    # adjacency[n] holds the numbers of the instances configured as servers on MISP_n
+    adjacency = {idx + 1: set(extract_server_numbers(servers)) for idx, servers in enumerate(server_lists)}
+    number_to_id = {idx + 1: server_number_to_id(servers) for idx, servers in enumerate(server_lists)}
 
-            # Skip bidirectionnel
-            if source_index in target_links:
+    for puller_index, remote_indexes in adjacency.items():
+        for remote_index in sorted(remote_indexes):
+            # Skip bidirectional links
+            if puller_index in adjacency[remote_index]:
                 continue
 
-            # Si la cible ne pointe pas vers la source → sens normal
-            if source_index in source_links and source_index not in target_links:
-                pass
-            else:
-                # Sens inverse
-                source_instance, target_instance = target_instance, source_instance
-                source_index, target_index = target_index, source_index
-
-            # Trouver l'ID du serveur sur la cible qui pointe vers la source
-            server_id = None
-            for server in misps_site_admin[target_index - 1].servers():
-                if str(source_index) in server['Server']['name']:
-                    server_id = server['Server']['id']
-                    break
-
-            if server_id is None:
-                continue
+            # The instance holding the server configuration pulls from the remote one.
+            # Both maps come from the same parsed names, so the entry always exists.
+            server_id = number_to_id[puller_index][remote_index]
+            yield (misps_org_admin[remote_index - 1], misps_org_admin[puller_index - 1],
+                   remote_index, puller_index, server_id)
 
-            return source_instance, target_instance, source_index, target_index, server_id
+def find_unidirectional_link():
+    """
+    Find a source/target pair for a unidirectional link.
+    Returns (source_instance, target_instance, source_index, target_index, server_id).
+    """
+    link = next(iter_unidirectional_links(), None)
+    if link is None:
+        raise Exception("No unidirectional connection found between any instances.")
+    return link
 
-    raise Exception("No unidirectional connection found between any instances.")
+PURGE_PAGE_SIZE = 1000
 
 def purge_events_and_blocklists(instance):
     """
     Delete all events and all event blocklists from a given MISP instance.
+    Events are fetched and mass-deleted in pages of PURGE_PAGE_SIZE, blocklists in a single request.
     """
     # Delete all events
-    for event in instance.search():
-        #print(f"Deleting Event {event['Event']['id']} on instance {instance.root_url}")
-        instance.delete_event(event['Event']['id'])
+    while True:
+        # The minimal index only returns id/uuid/timestamps, no attributes or correlations.
+        # Deleted events leave the index, so the first page is always the next batch.
+        page = request(instance, 'POST', 'events/index', {'minimal': 1, 'limit': PURGE_PAGE_SIZE, 'page': 1})
+        event_ids = [event['id'] for event in page]
+        if not event_ids:
+            break
+        request(instance, 'POST', 'events/delete', {'id': event_ids})
+        if len(event_ids) < PURGE_PAGE_SIZE:
+            break
 
     # Delete all event blocklists
-    blocklists = instance.event_blocklists()
-    for block in blocklists:
-        #print(block)
-        block_id = block['id']
-        #print(f"Deleting EventBlocklist {block_id} on instance {instance.root_url}")
-        instance.delete_event_blocklist(block_id)
+    block_ids = [block['id'] for block in instance.event_blocklists()]
+    if block_ids:
+        request(instance, 'POST', 'event_blocklists/massDelete', {'ids': json.dumps(block_ids)})
     print(f"Purged all events and blocklists on instance {instance.root_url}")
 
 
+def purge_all_instances():
+    """
+    Purge events and event blocklists from every MISP instance concurrently.
+    """
+    parallel_map(purge_events_and_blocklists, misps_site_admin)
+
+
+def delete_events_everywhere(uuids):
+    """
+    Delete the given events from every MISP instance concurrently.
+    Instances that do not hold one of the events answer with an error, which is ignored.
+    """
+    parallel_map(lambda pair: pair[0].delete_event(pair[1]), list(itertools.product(misps_site_admin, uuids)))
+
+
+class SyncTestCase(unittest.TestCase):
+    """
+    Base class of the synchronisation suites.
+    Each test records the events it creates with _track, and they are deleted from every instance after the test,
+    even when it fails. All instances are purged once after the whole class as a safety net.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        purge_all_instances()
+
+    # Unidirectional link shared by the pull tests of a class, looked up by the first of them
+    _link = None
+
+    @classmethod
+    def _pull_link(cls):
+        """
+        Return the (source_instance, target_instance, source_index, target_index, server_id) link the pull tests use.
+        The lookup raises when no unidirectional link exists, so it is not done in setUpClass, where it would also fail the push tests.
+        The link is cached on the test class itself, so each suite looks it up once.
+        """
+        if cls._link is None:
+            cls._link = find_unidirectional_link()
+        return cls._link
+
+    def setUp(self):
+        self._created_uuids = []
+
+    def tearDown(self):
+        delete_events_everywhere(self._created_uuids)
+
+    def _track(self, uuid: str):
+        """
+        Record an event created by the test, so that it is deleted from every instance after the test.
+        """
+        self._created_uuids.append(uuid)
+
+
 def check_response(response):
     """
     Raise an exception if the response contains errors, otherwise return the response.
     """
-    if isinstance(response, dict) and "errors" in response:
-        raise Exception(response["errors"])
+    errors = response.get("errors") if isinstance(response, dict) else None
+    if errors is not None:
+        raise Exception(errors)
     return response
 
 
-def request(pymisp: PyMISP, request_type: str, url: str, data: dict = {}) -> dict:
+def request(pymisp: PyMISP, request_type: str, url: str, data: Optional[dict] = None) -> dict:
     """
     Send a raw request to the MISP API using PyMISP internals.
-    Returns the checked response.
+    The body is only serialized when data is given.
+    Returns the parsed response, raising an exception if it contains errors.
+    """
+    if data is None:
+        response = pymisp._prepare_request(request_type, url)
+    else:
+        response = pymisp._prepare_request(request_type, url, data)
+    return check_response(pymisp._check_response(response))
+
+
+def search_meta(pymisp: PyMISP, uuid: str):
+    """
+    Search an event by UUID, returning only its metadata (no attributes, objects or correlations).
+    Enough to check that an event is present and to read its distribution. A UUID matches a single event, so the search stops at the first one.
+    """
+    return pymisp.search(controller='events', uuid=uuid, metadata=True, limit=1, pythonify=False)
+
+
+def event_notes(pymisp: PyMISP, uuid: str) -> dict:
+    """
+    Fetch the notes attached to an event in a single search, instead of one request per note.
+    Returns the notes visible to the user keyed by UUID, empty if the event is not found.
+    """
+    # PyMISP has no argument for this flag and forwards unknown ones to restSearch as is, so it takes MISP's own name
+    events = pymisp.search(controller='events', uuid=uuid, includeAnalystData=True, limit=1, pythonify=True)
+    if not isinstance(events, list):
+        return {}
+    return {note.uuid: note for event in events for note in event.notes}
+
+
+def push_to_servers(pymisp: PyMISP, servers_id, event: Optional[Union[MISPEvent, int, str]] = None):
+    """
+    Trigger a push to every given server of the instance concurrently.
+    Pushes only the given event if any, otherwise performs a full push.
+    Returns the checked push responses in the order of servers_id.
+    """
+    responses = parallel_map(lambda server_id: pymisp.server_push(server=server_id, event=event), servers_id)
+    return [check_response(response) for response in responses]
+
+
+# Fields shared by the bodies of every test galaxy creation
+GALAXY_TEMPLATE = {'namespace': 'MISP Test'}
+
+
+def add_galaxy(pymisp: PyMISP, name: str, distribution: int, description: str) -> MISPGalaxy:
+    """
+    Create a custom galaxy on the given MISP instance (not implemented in PyMISP).
+    The galaxy is built from the creation response rather than by listing every galaxy of the instance.
     """
-    response = pymisp._prepare_request(request_type, url, data)
-    return pymisp._check_response(response)
+    response = request(pymisp, 'POST', 'galaxies/add', {
+        **GALAXY_TEMPLATE,
+        'name': name,
+        'distribution': distribution,
+        'description': description
+    })
+    galaxy = MISPGalaxy()
+    galaxy.from_dict(**response)
+    return galaxy
+
+
+def add_published_galaxy_clusters(pymisp: PyMISP, galaxy, clusters):
+    """
+    Add each cluster to the galaxy and publish it, handling the clusters concurrently.
+    MISP has no batch endpoint for either call, so each cluster still costs two requests.
+    Returns the added clusters in the order given.
+    """
+    def add_and_publish(cluster):
+        added = check_response(pymisp.add_galaxy_cluster(galaxy, cluster, pythonify=True))
+        check_response(pymisp.publish_galaxy_cluster(cluster.uuid))
+        return added
+    return parallel_map(add_and_publish, clusters)
+
+
+def add_analyst_data_many(pymisp: PyMISP, analyst_data):
+    """
+    Add several analyst data (notes, opinions, relationships) on the given MISP instance, concurrently.
+    MISP has no batch endpoint for analyst data, so each one still costs a request.
+    Returns the added analyst data in the order given.
+    """
+    return parallel_map(lambda element: check_response(pymisp.add_analyst_data(element, pythonify=True)), analyst_data)
 
 
 def publish_immediately(pymisp: PyMISP, event: Union[MISPEvent, int, str, uuid.UUID], with_email: bool = False):
@@ -171,7 +532,36 @@ def publish_immediately(pymisp: PyMISP, event: Union[MISPEvent, int, str, uuid.U
     """
     event_id = get_uuid_or_id_from_abstract_misp(event)
     action = "alert" if with_email else "publish"
-    return check_response(request(pymisp, 'POST', f'events/{action}/{event_id}/disable_background_processing:1'))
+    return request(pymisp, 'POST', f'events/{action}/{event_id}/disable_background_processing:1')
+
+def update_and_publish(pymisp: PyMISP, event: MISPEvent, with_email: bool = False) -> MISPEvent:
+    """
+    Update an event on the given MISP instance, then publish it immediately.
+    The edit endpoint can publish as well, but it does so through the background workers,
+    which would race with the pushes and searches that follow.
+    Returns the updated event.
+    """
+    event = check_response(pymisp.update_event(event, pythonify=True))
+    publish_immediately(pymisp, event, with_email=with_email)
+    return event
+
+def attribute_count_after_update(pymisp: PyMISP, event: MISPEvent) -> Optional[int]:
+    """
+    Send an update of the event to the given MISP instance.
+    Returns the number of attributes of the event as the instance stored it, read from the update response,
+    or None when the instance rejected the update.
+    """
+    response = pymisp.update_event(event)
+    if not isinstance(response, dict) or 'errors' in response:
+        return None
+    return len(response['Event'].get('Attribute', []))
+
+def publish_many(pymisp: PyMISP, events: Iterable[Union[MISPEvent, int, str, uuid.UUID]], with_email: bool = False, workers: int = 16):
+    """
+    Publish several events immediately on the given MISP instance, concurrently.
+    Returns the responses in the order of the given events.
+    """
+    return parallel_map(lambda event: publish_immediately(pymisp, event, with_email=with_email), events, max_workers=workers)
 
 def unpublish_immediately(pymisp: PyMISP, event: Union[MISPEvent, int, str, uuid.UUID]):
     """
@@ -179,4 +569,4 @@ def unpublish_immediately(pymisp: PyMISP, event: Union[MISPEvent, int, str, uuid
     Disables background processing for faster propagation.
     """
     event_id = get_uuid_or_id_from_abstract_misp(event)
-    return check_response(request(pymisp, 'POST', f'events/unpublish/{event_id}/disable_background_processing:1'))
+    return request(pymisp, 'POST', f'events/unpublish/{event_id}/disable_background_processing:1')
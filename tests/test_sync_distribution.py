@@ -1,11 +1,83 @@
-import unittest
-import time
-import uuid as UUID
-from common import misps_site_admin, misps_org_admin, create_event, publish_immediately, check_response, get_servers_id, extract_server_numbers, find_unidirectional_link, purge_events_and_blocklists
+import logging
+from common import misps_site_admin, misps_org_admin, cached_servers, create_event, create_galaxy_cluster, publish_immediately, update_and_publish, check_response, get_servers_id, extract_server_numbers, push_to_servers, add_galaxy, add_published_galaxy_clusters, add_analyst_data_many, parallel_map, search_meta, event_notes, wait_for, is_found, uuid_set, has_distribution, SYNC_TIMEOUT, ABSENCE_TIMEOUT, servers_info, SyncTestCase
 from pymisp import MISPGalaxy, MISPGalaxyCluster, MISPNote
 
+log = logging.getLogger(__name__)
+
+# Description of the test clusters for each distribution level
+CLUSTER_DESCRIPTIONS = [f"Cluster with distribution {distribution}" for distribution in range(4)]
+
+
+class TestDistributionLevel(SyncTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The servers configured on the first instance do not change during the run
+        servers = cached_servers(0)
+        cls.servers_id, cls.linked_server_numbers = servers_info(servers)
+        # (instance number, connector) pairs of the linked instances, as org admin and as site admin
+        cls.linked_org_targets = [(number, misps_org_admin[number - 1]) for number in cls.linked_server_numbers]
+        cls.linked_site_targets = [(number, misps_site_admin[number - 1]) for number in cls.linked_server_numbers]
+
+    def _add_published_event(self, source_instance, name, distribution):
+        """
+        Create an event with the given distribution level on the source instance and publish it.
+        """
+        event = create_event(name)
+        event.distribution = distribution
+
+        event = source_instance.add_event(event, pythonify=True)
+        check_response(event)
+        self.assertIsNotNone(event.id)
+        self._track(event.uuid)
+        publish_immediately(source_instance, event, with_email=False)
+        return event
+
+    def _republish_with_distribution(self, source_instance, event, distribution):
+        """
+        Change the distribution level of an existing event on the source instance and publish it again.
+        """
+        event.distribution = distribution
+        return update_and_publish(source_instance, event)
+
+    def _assert_not_propagated(self, uuid, distribution, window=ABSENCE_TIMEOUT, interval=0.1):
+        """
+        Watch the linked instances for an event that must not have been pushed to them.
+        The push may be queued to the background workers, so the instances are watched for ABSENCE_TIMEOUT seconds,
+        like the other absence checks, and the assertion fails as soon as the event shows up on any of them.
+        """
+        results = parallel_map(lambda target: wait_for(lambda: search_meta(target[1], uuid), timeout=window, interval=interval), self.linked_org_targets)
+        for (target_index, _), search_results in zip(self.linked_org_targets, results):
+            self.assertEqual(
+                len(search_results), 0,
+                f"Event unexpectedly found on MISP_{target_index} with distribution level {distribution}"
+            )
+
+    def _add_event_with_notes(self, source_instance, name, note_dists, note_text):
+        """
+        Create an event with distribution 3 on the source instance and attach one note per given distribution level.
+        The notes read "<note_text> <distribution>". Returns the event and the notes, in the order of note_dists.
+        """
+        event = create_event(name)
+        event.distribution = 3
+        event = source_instance.add_event(event, pythonify=True)
+        check_response(event)
+        self.assertIsNotNone(event.id)
+        self._track(event.uuid)
+
+        notes = []
+        for dist in note_dists:
+            note = MISPNote()
+            note.object_type = 'Event'
+            note.object_uuid = event.uuid
+            note.note = f"{note_text} {dist}"
+            note.distribution = dist
+            notes.append(note)
+        add_analyst_data_many(source_instance, notes)
+        return event, notes
+
+    # (event distribution, must be pushed to the linked instances)
+    EVENT_PUSH_MATRIX = [(0, False), (1, False), (2, True)]
 
-class TestDistributionLevel(unittest.TestCase):
     def testEventDistributionLevelOnPush(self):
         """
         Explicitly tests the impact of the event distribution level on push synchronization between MISP instances.
@@ -21,100 +93,48 @@ class TestDistributionLevel(unittest.TestCase):
         # Use the first MISP instance as source
         source_instance = misps_org_admin[0]
 
-        # Create an event with distribution level 0 (Your organisation only)
-        event = create_event('Event for distribution level 1')
-        event.distribution = 0
-
-        event = source_instance.add_event(event, pythonify=True)
-        check_response(event)
-        self.assertIsNotNone(event.id)
-        uuid = event.uuid
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Give time for sync propagation
-
         # Get the server configurations linked to this instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
+        servers_id = self.servers_id
         if not servers_id:
             raise Exception("No server configuration found for the source instance")
 
-        # Push the event to each linked server (before publication)
-        for server_id in servers_id:
-            push_response = misps_site_admin[0].server_push(server=server_id, event=event.id)
-            time.sleep(2)  # Allow time for push to complete
-            check_response(push_response)
-
-        # Verify that the event is NOT present on any target instances
-        linked_server_numbers = extract_server_numbers(servers)
-        for target_index in linked_server_numbers:
-            target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
-            self.assertEqual(
-                len(search_results), 0,
-                f"Event unexpectedly found on MISP_{target_index} with distribution level 1"
-            )
-
-        # Now change the distribution level to 1 (This community only)
-        event.distribution = 1
-        event = source_instance.update_event(event, pythonify=True)
-        check_response(event)
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Give time for sync propagation
-
-        # Push the updated event to each linked server
-        for server_id in servers_id:
-            push_response = misps_site_admin[0].server_push(server=server_id, event=event.id)
-            time.sleep(2)  # Allow time for push to complete
-            check_response(push_response)
-
-        # Verify that the event is still NOT present on any target instances
-        for target_index in linked_server_numbers:
-            target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
-            self.assertEqual(
-                len(search_results), 0,
-                f"Event unexpectedly found on MISP_{target_index} with distribution level 2"
-            )
-
-        # Change the distribution level to 2 (Connected communities)
-        event.distribution = 2
-        event = source_instance.update_event(event, pythonify=True)
-        check_response(event)
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Give time for sync propagation
-
-        # Push the updated event to each linked server
-        for server_id in servers_id:
-            push_response = misps_site_admin[0].server_push(server=server_id, event=event.id)
-            time.sleep(2)  # Allow time for push to complete
-            check_response(push_response)
-
-        # Verify that the event is present on all target instances in connected communities
-        for target_index in linked_server_numbers:
-            target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
-            self.assertGreater(
-                len(search_results), 0,
-                f"Event not found on MISP_{target_index} with distribution level 3"
-            )
+        event = None
+        for distribution, pushed in self.EVENT_PUSH_MATRIX:
+            # The same event is reused for every distribution level
+            if event is None:
+                event = self._add_published_event(source_instance, 'Event for distribution level', distribution)
+            else:
+                event = self._republish_with_distribution(source_instance, event, distribution)
+            uuid = event.uuid
+
+            # Push the event to each linked server
+            push_to_servers(misps_site_admin[0], servers_id, event=event.id)
+
+            # Verify the presence or absence of the event on the target instances
+            if not pushed:
+                self._assert_not_propagated(uuid, distribution)
+                continue
+            results = parallel_map(lambda target: wait_for(lambda: search_meta(target[1], uuid)), self.linked_org_targets)
+            for (target_index, _), search_results in zip(self.linked_org_targets, results):
+                self.assertGreater(
+                    len(search_results), 0,
+                    f"Event not found on MISP_{target_index} with distribution level {distribution}"
+                )
 
         # Change the distribution level to 3 (All communities)
-        event.distribution = 3
-        event = source_instance.update_event(event, pythonify=True)
-        check_response(event)
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Give time for sync propagation
+        event = self._republish_with_distribution(source_instance, event, 3)
 
         # Verify presence on all reachable instances
-        for index, target_instance in enumerate(misps_org_admin, start=1):
-            search_results = target_instance.search(uuid=uuid)
+        results = parallel_map(lambda target_instance: wait_for(lambda: search_meta(target_instance, uuid)), misps_org_admin)
+        for index, search_results in enumerate(results, start=1):
             self.assertGreater(
                 len(search_results), 0,
                 f"Event not found on MISP_{index} with distribution level 3"
             )
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
+
+    # (event distribution, whether the event must be searched as site admin on the target)
+    # Your organisation only is related to the organisation of the user who can pull e.g. the site admin
+    EVENT_PULL_MATRIX = [(0, True), (1, True), (2, False)]
 
     def testEventDistributionLevelOnPull(self):
         """
@@ -128,94 +148,45 @@ class TestDistributionLevel(unittest.TestCase):
 
         The test creates an event, changes its distribution level step by step, pulls it, and verifies its presence or absence on target instances according to the distribution level.
         """
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
-        print(f"Pulling from MISP_{source_index} on MISP_{target_index}")
-
-        # Create and publish an event on the source
-        event = create_event('Event for distribution level')
-        event.distribution = 0
-
-        event = source_instance.add_event(event, pythonify=True)
-        check_response(event)
-        self.assertIsNotNone(event.id)
-        uuid = event.uuid
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Give time for sync propagation
-
-        # Perform the pull on the target
-        pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
-        time.sleep(5)  # Allow time for pull to complete
-        check_response(pull_result)
-
-        # Confirm the event exist on the target with distribution level 0
-        found = False
-        results = misps_site_admin[target_index - 1].search(uuid=uuid)  # Need to search on the misps_site_admin because the Your organisation only is related to the organisation of the user who can pull e.g. the site admin
-        if results:
-            found = True
-
-        self.assertTrue(found, f"Event not found on MISP_{target_index} after pull and publication.")
-
-        # Now change the distribution level to 1 (This community only)
-        event.distribution = 1
-        event = source_instance.update_event(event, pythonify=True)
-        check_response(event)
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Give time for sync propagation
-
-        # Perform the pull again
-        pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
-        check_response(pull_result)
-        time.sleep(5)  # Allow time for pull to complete
-
-        # Confirm the event now exists on the target
-        results = misps_site_admin[target_index - 1].search(uuid=uuid)
-        found = False
-        if results:
-            found = True
-        self.assertTrue(found, f"Event not found on MISP_{target_index} after pull and publication.")
-
-        # Now change the distribution level to 2 (Connected communities)
-        event.distribution = 2
-        event = source_instance.update_event(event, pythonify=True)
-        check_response(event)
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Give time for sync propagation
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
+        log.debug("Pulling from MISP_%d on MISP_%d", source_index, target_index)
+        target_site_admin = misps_site_admin[target_index - 1]
+
+        event = None
+        for distribution, as_site_admin in self.EVENT_PULL_MATRIX:
+            # The same event is reused for every distribution level
+            if event is None:
+                event = self._add_published_event(source_instance, 'Event for distribution level', distribution)
+            else:
+                event = self._republish_with_distribution(source_instance, event, distribution)
+            uuid = event.uuid
 
-        # Perform the pull again
-        pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
-        check_response(pull_result)
-        time.sleep(5)  # Allow time for pull to complete
+            # Perform the pull on the target
+            pull_result = target_site_admin.server_pull(server=server_id)
+            check_response(pull_result)
 
-        # Confirm the event now exists on the target
-        results = target_instance.search(uuid=uuid)
-        found = False
-        if results:
-            found = True
-        self.assertTrue(found, f"Event not found on MISP_{target_index} after pull and publication.")
+            # Confirm the event exists on the target
+            search_instance = target_site_admin if as_site_admin else target_instance
+            results = wait_for(lambda: search_meta(search_instance, uuid))
+            self.assertTrue(results, f"Event not found on MISP_{target_index} after pull and publication with distribution level {distribution}.")
 
         # Now change the distribution level to 3 (All communities)
-        event.distribution = 3
-        event = source_instance.update_event(event, pythonify=True)
-        check_response(event)
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Give time for sync propagation
+        event = self._republish_with_distribution(source_instance, event, 3)
 
         # Perform the pull again
-        pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
+        pull_result = target_site_admin.server_pull(server=server_id)
         check_response(pull_result)
-        time.sleep(5)  # Allow time for pull to complete
 
         # Verify presence on all reachable instances
-        for index, target_instance in enumerate(misps_org_admin, start=1):
-            search_results = target_instance.search(uuid=uuid)
+        results = parallel_map(lambda target_instance: wait_for(lambda: search_meta(target_instance, uuid)), misps_org_admin)
+        for index, search_results in enumerate(results, start=1):
             self.assertGreater(
                 len(search_results), 0,
                 f"Event not found on MISP_{index} with distribution level 3"
             )
 
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
+    # (event distribution, expected distribution on the linked instances after push)
+    EVENT_PUSH_DOWNGRADE_MATRIX = [(2, 1), (3, 3)]
 
     def testEventDowngradeDistributionLevelOnPush(self):
         """ 
@@ -230,71 +201,36 @@ class TestDistributionLevel(unittest.TestCase):
         # Use the first MISP instance as source
         source_instance = misps_org_admin[0]
 
-        # Create an event with distribution level 2 (Connected communities)
-        event = create_event('Event for downgrade distribution level')
-        event.distribution = 2
-
-        event = source_instance.add_event(event, pythonify=True)
-        check_response(event)
-        self.assertIsNotNone(event.id)
-        uuid = event.uuid
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Give time for sync propagation
-
         # Get the server configurations linked to this instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
+        servers_id = self.servers_id
         if not servers_id:
             raise Exception("No server configuration found for the source instance")
 
-        # Push the event to each linked server (before publication)
-        for server_id in servers_id:
-            push_response = misps_site_admin[0].server_push(server=server_id, event=event.id)
-            time.sleep(2)  # Allow time for push to complete
-            check_response(push_response)
-
-        # Verify that the event is present on all target instances in connected communities with distribution level 1
-        linked_server_numbers = extract_server_numbers(servers)
-        for target_index in linked_server_numbers:
-            target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
-            # Check if the event is present with distribution level 1
-            self.assertGreater(
-                len(search_results), 0,
-                f"Event not found on MISP_{target_index} with distribution level 1"
-            )
-            for result in search_results:
-                self.assertEqual(int(result['Event']['distribution']), 1,
-                                 f"Event on MISP_{target_index} has incorrect distribution level {result['Event']['distribution']}")
+        event = None
+        for distribution, expected_distribution in self.EVENT_PUSH_DOWNGRADE_MATRIX:
+            # The same event is reused for every distribution level
+            if event is None:
+                event = self._add_published_event(source_instance, 'Event for downgrade distribution level', distribution)
+            else:
+                event = self._republish_with_distribution(source_instance, event, distribution)
+            uuid = event.uuid
+
+            # Push the event to each linked server
+            push_to_servers(misps_site_admin[0], servers_id, event=event.id)
+
+            # Verify that the event is present on all target instances in connected communities with the expected distribution level
+            results = parallel_map(lambda target: wait_for(lambda: search_meta(target[1], uuid), has_distribution(expected_distribution)), self.linked_org_targets)
+            for (target_index, _), search_results in zip(self.linked_org_targets, results):
+                self.assertGreater(
+                    len(search_results), 0,
+                    f"Event not found on MISP_{target_index} after pushing with distribution level {distribution}"
+                )
+                distributions = {int(result['Event']['distribution']) for result in search_results}
+                self.assertEqual(distributions, {expected_distribution},
+                                 f"Event on MISP_{target_index} has incorrect distribution levels {distributions}")
 
-        # Now change the distribution level to 3 (All communities)
-        event.distribution = 3
-        event = source_instance.update_event(event, pythonify=True)
-        check_response(event)
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)
-
-        # Push the updated event to each linked server
-        for server_id in servers_id:
-            push_response = misps_site_admin[0].server_push(server=server_id, event=event.id)
-            time.sleep(2)  # Allow time for push to complete
-            check_response(push_response)
-
-        # Verify that the event is still present on all target instances in connected communities with distribution level 3
-        for target_index in linked_server_numbers:
-            target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
-            self.assertGreater(
-                len(search_results), 0,
-                f"Event not found on MISP_{target_index} after pushing with distribution level 3"
-            )
-            for result in search_results:
-                self.assertEqual(int(result['Event']['distribution']), 3,
-                                 f"Event on MISP_{target_index} has incorrect distribution level {result['Event']['distribution']}")
-                
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
+    # (event distribution, expected distribution on the target after pull, whether to search as site admin on the target)
+    EVENT_PULL_DOWNGRADE_MATRIX = [(1, 0, True), (2, 1, False), (3, 3, False)]
 
     def testEventDowngradeDistributionLevelOnPull(self):
         """ 
@@ -307,87 +243,31 @@ class TestDistributionLevel(unittest.TestCase):
 
         The test creates an event, pulls it, checks the downgrade, updates the event, pulls again, and verifies the new distribution level.
         """
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
-        print(f"Pulling from MISP_{source_index} on MISP_{target_index}")
-
-        # Create and publish an event on the source
-        event_name = f"Event {source_index} for pull on {target_index} on downgrade distribution level"
-        event = create_event(event_name)
-        event.distribution = 1
-
-        event = source_instance.add_event(event, pythonify=True)
-        check_response(event)
-        self.assertIsNotNone(event.id)
-        uuid = event.uuid
-        # Publish the event immediately
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2) # Give time for sync propagation
-
-        # Perform the pull on the target
-        pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id, event=event.id)
-        time.sleep(5)
-        check_response(pull_result)
-
-        # Confirm the event exists on the target with distribution level 0
-        found = False
-        results = misps_site_admin[target_index - 1].search(uuid=uuid) # Need to search on the misps_site_admin because the Your organisation only is related to the organisation of the user who can pull e.g. the site admin
-        if results:
-            found = True
-            for result in results:
-                self.assertEqual(int(result['Event']['distribution']), 0,
-                                    f"Event on MISP_{target_index} has incorrect distribution level {result['Event']['distribution']}")
-
-        self.assertTrue(found, f"Event not found on MISP_{target_index} after pull with distribution level 0.")
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
+        log.debug("Pulling from MISP_%d on MISP_%d", source_index, target_index)
+        target_site_admin = misps_site_admin[target_index - 1]
+
+        event = None
+        for distribution, expected_distribution, as_site_admin in self.EVENT_PULL_DOWNGRADE_MATRIX:
+            # The same event is reused for every distribution level
+            if event is None:
+                event_name = f"Event {source_index} for pull on {target_index} on downgrade distribution level"
+                event = self._add_published_event(source_instance, event_name, distribution)
+            else:
+                event = self._republish_with_distribution(source_instance, event, distribution)
+            uuid = event.uuid
 
-        # Now change the distribution level to 2 (Connected communities)
-        event.distribution = 2
-        event = source_instance.update_event(event, pythonify=True)
-        check_response(event)
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Give time for sync propagation
-
-        # Perform the pull again to get the updated event
-        pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id, event=event.id)
-        time.sleep(5)
-        check_response(pull_result)
-        # Confirm the event now exists on the target with distribution level 1
-        results = target_instance.search(uuid=uuid)
-        found = False
-        if results:
-            found = True
-            for result in results:
-                self.assertEqual(int(result['Event']['distribution']), 1,
-                                    f"Event on MISP_{target_index} has incorrect distribution level {result['Event']['distribution']}")
-
-        self.assertTrue(found, f"Event not found on MISP_{target_index} after pull with distribution level 2.")
-
-        # Now change the distribution level to 3 (All communities)
-        event.distribution = 3
-        event = source_instance.update_event(event, pythonify=True)
-        check_response(event)
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Give time for sync propagation
-
-        # Perform the pull again to get the updated event
-        pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id, event=event.id)
-        time.sleep(5)
-        check_response(pull_result)
-
-        # Confirm the event now exists on the target with distribution level 3
-        results = target_instance.search(uuid=uuid)
-        found = False
-        if results:
-            found = True
-            for result in results:
-                self.assertEqual(int(result['Event']['distribution']), 3,
-                                    f"Event on MISP_{target_index} has incorrect distribution level {result['Event']['distribution']}")
-
-        self.assertTrue(found, f"Event not found on MISP_{target_index} after pull with distribution level 3.")
-
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
+            # Perform the pull on the target
+            pull_result = target_site_admin.server_pull(server=server_id, event=event.id)
+            check_response(pull_result)
 
+            # Confirm the event exists on the target with the expected distribution level
+            search_instance = target_site_admin if as_site_admin else target_instance
+            results = wait_for(lambda: search_meta(search_instance, uuid), has_distribution(expected_distribution))
+            self.assertTrue(results, f"Event not found on MISP_{target_index} after pull with distribution level {distribution}.")
+            distributions = {int(result['Event']['distribution']) for result in results}
+            self.assertEqual(distributions, {expected_distribution},
+                             f"Event on MISP_{target_index} has incorrect distribution levels {distributions}")
 
     def testGalaxyDistributionLevelOnPush(self):
         """
@@ -401,69 +281,55 @@ class TestDistributionLevel(unittest.TestCase):
         """
         source_instance = misps_org_admin[0]
 
-        # Loop over galaxy distribution levels
-        for galaxy_dist in range(4):
-            galaxy_name = f"Galaxy Dist {galaxy_dist} on Push"
-            print(f"\n=== Testing Galaxy distribution level {galaxy_dist} ===")
-
-            # Create galaxy with the given distribution
-            source_instance._check_response(source_instance._prepare_request(
-                'POST',
-                '/galaxies/add',
-                data={
-                    'name': galaxy_name,
-                    'namespace': 'MISP Test',
-                    'distribution': galaxy_dist,
-                    'description': f'Testing galaxy distribution level {galaxy_dist}'
-                }
-            ))
-            new_galaxy = source_instance.galaxies(pythonify=True)[-1]
-
-            # Create 4 clusters with distribution levels 0,1,2,3
-            cluster_uuids = {}
-            for cluster_dist in range(4):
-                cluster_uuid = str(UUID.uuid4())
-                cluster = MISPGalaxyCluster()
-                cluster.uuid = cluster_uuid
-                cluster.value = f"Cluster Dist {cluster_dist} for Galaxy {galaxy_dist}"
-                cluster.authors = ["CIRCL"]
-                cluster.distribution = cluster_dist
-                cluster.description = f"Cluster with distribution {cluster_dist}"
-                source_instance.add_galaxy_cluster(new_galaxy, cluster, pythonify=True)
-
-                # Publish cluster
-                source_instance.publish_galaxy_cluster(cluster.uuid)
-                cluster_uuids[cluster_dist] = cluster.uuid
-
-            time.sleep(2)  # allow sync
-
-            # Get servers connected to source
-            servers = misps_site_admin[0].servers()
-            servers_id = get_servers_id(servers)
-            if not servers_id:
-                raise Exception("No server configuration found for the source instance")
-
-            linked_server_numbers = extract_server_numbers(servers)
-
-            # Check propagation on each target server
-            for target_index in linked_server_numbers:
-                target_instance = misps_site_admin[target_index - 1]
-                # Retrieve galaxy with its clusters
-                target_galaxy = target_instance.get_galaxy(new_galaxy, withCluster=True, pythonify=True)
+        # Get the server configurations linked to this instance
+        servers_id = self.servers_id
+        if not servers_id:
+            raise Exception("No server configuration found for the source instance")
 
-                # For galaxies with dist 0 or 1, the galaxy itself should not be visible
-                if galaxy_dist in (0, 1):
-                    self.assertTrue(isinstance(target_galaxy, dict) and "errors" in target_galaxy, f"Galaxy should NOT propagate for galaxy dist {galaxy_dist}, but found {target_galaxy}")
-                elif galaxy_dist in (2, 3):
-                    self.assertIsNotNone(target_galaxy, f"Galaxy should propagate for galaxy dist {galaxy_dist}, but found None")
-                    clusters = target_instance.search_galaxy_clusters(target_galaxy, pythonify=True)
-                    found_uuids = {c.uuid for c in clusters} if clusters else set()
-                    # Only clusters dist 2 and 3 must propagate
-                    self.assertNotIn(cluster_uuids[0], found_uuids, f"Cluster dist 0 (uuid={cluster_uuids[0]}) should NOT propagate for galaxy dist {galaxy_dist}")
-                    self.assertNotIn(cluster_uuids[1], found_uuids, f"Cluster dist 1 (uuid={cluster_uuids[1]}) should NOT propagate for galaxy dist {galaxy_dist}")
-                    self.assertIn(cluster_uuids[2], found_uuids, f"Cluster dist 2 (uuid={cluster_uuids[2]}) should propagate for galaxy dist {galaxy_dist}")
-                    self.assertIn(cluster_uuids[3], found_uuids, f"Cluster dist 3 (uuid={cluster_uuids[3]}) should propagate for galaxy dist {galaxy_dist}")
+        # Create the galaxies of every tested distribution level concurrently
+        galaxy_dists = range(4)
+        galaxies = parallel_map(
+            lambda galaxy_dist: add_galaxy(source_instance, f"Galaxy Dist {galaxy_dist} on Push", galaxy_dist, f'Testing galaxy distribution level {galaxy_dist}'),
+            galaxy_dists)
 
+        # Loop over galaxy distribution levels
+        for galaxy_dist, new_galaxy in zip(galaxy_dists, galaxies):
+            with self.subTest(galaxy_dist=galaxy_dist):
+                log.debug("=== Testing Galaxy distribution level %d ===", galaxy_dist)
+
+                # Create 4 clusters with distribution levels 0,1,2,3
+                clusters = [
+                    create_galaxy_cluster(f"Cluster Dist {cluster_dist} for Galaxy {galaxy_dist}", cluster_dist, CLUSTER_DESCRIPTIONS[cluster_dist])
+                    for cluster_dist in range(4)
+                ]
+
+                # Add and publish the clusters
+                add_published_galaxy_clusters(source_instance, new_galaxy, clusters)
+                cluster_uuids = {cluster.distribution: cluster.uuid for cluster in clusters}
+                # Only clusters dist 2 and 3 must propagate
+                expected_uuids = {cluster_uuids[2], cluster_uuids[3]}
+                unexpected_uuids = {cluster_uuids[0], cluster_uuids[1]}
+
+                # Check propagation on each target server
+                def fetch_target_galaxy(target):
+                    # Retrieve galaxy with its clusters
+                    _, target_instance = target
+                    target_galaxy = wait_for(lambda: target_instance.get_galaxy(new_galaxy, withCluster=True, pythonify=True), is_found,
+                                             timeout=ABSENCE_TIMEOUT if galaxy_dist in (0, 1) else SYNC_TIMEOUT)
+                    found_uuids = frozenset()
+                    if galaxy_dist in (2, 3):
+                        found_uuids = wait_for(lambda: uuid_set(target_instance.search_galaxy_clusters(target_galaxy, pythonify=True)),
+                                               lambda found: expected_uuids <= found)
+                    return target_galaxy, found_uuids
+
+                for (target_index, _), (target_galaxy, found_uuids) in zip(self.linked_site_targets, parallel_map(fetch_target_galaxy, self.linked_site_targets)):
+                    # For galaxies with dist 0 or 1, the galaxy itself should not be visible
+                    if galaxy_dist in (0, 1):
+                        self.assertTrue(isinstance(target_galaxy, dict) and "errors" in target_galaxy, f"Galaxy should NOT propagate for galaxy dist {galaxy_dist}, but found {target_galaxy}")
+                    elif galaxy_dist in (2, 3):
+                        self.assertIsNotNone(target_galaxy, f"Galaxy should propagate for galaxy dist {galaxy_dist}, but found None")
+                        self.assertFalse(found_uuids & unexpected_uuids, f"Clusters {sorted(found_uuids & unexpected_uuids)} should NOT propagate for galaxy dist {galaxy_dist}")
+                        self.assertEqual(found_uuids & expected_uuids, expected_uuids, f"Clusters {sorted(expected_uuids - found_uuids)} should propagate for galaxy dist {galaxy_dist}")
 
     def testGalaxyDistributionLevelOnPull(self):
         """
@@ -477,74 +343,58 @@ class TestDistributionLevel(unittest.TestCase):
             * Galaxy dist=2 or 3: only clusters dist=2 and 3 propagate
         """
         # Find unidirectional link
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
-        print(f"Pulling from MISP_{source_index} on MISP_{target_index}")
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
+        log.debug("Pulling from MISP_%d on MISP_%d", source_index, target_index)
+
+        # Create the galaxies of every tested distribution level concurrently
+        galaxy_dists = range(4)
+        galaxies = parallel_map(
+            lambda galaxy_dist: add_galaxy(source_instance, f"Galaxy Dist {galaxy_dist} on Pull", galaxy_dist, f'Testing galaxy distribution level {galaxy_dist}'),
+            galaxy_dists)
 
         # Loop over galaxy distribution levels
-        for galaxy_dist in range(4):
-            galaxy_name = f"Galaxy Dist {galaxy_dist} on Pull"
-            print(f"\n=== Testing Galaxy distribution level {galaxy_dist} ===")
-
-            # Create galaxy with the given distribution
-            source_instance._check_response(source_instance._prepare_request(
-                'POST',
-                '/galaxies/add',
-                data={
-                    'name': galaxy_name,
-                    'namespace': 'MISP Test',
-                    'distribution': galaxy_dist,
-                    'description': f'Testing galaxy distribution level {galaxy_dist}'
-                }
-            ))
-            new_galaxy = source_instance.galaxies(pythonify=True)[-1]
-
-            # Create 4 clusters with distribution levels 0,1,2,3
-            cluster_uuids = {}
-            for cluster_dist in range(4):
-                cluster_uuid = str(UUID.uuid4())
-                cluster = MISPGalaxyCluster()
-                cluster.uuid = cluster_uuid
-                cluster.value = f"Cluster Dist {cluster_dist} for Galaxy {galaxy_dist}"
-                cluster.authors = ["CIRCL"]
-                cluster.distribution = cluster_dist
-                cluster.description = f"Cluster with distribution {cluster_dist}"
-                source_instance.add_galaxy_cluster(new_galaxy, cluster, pythonify=True)
+        for galaxy_dist, new_galaxy in zip(galaxy_dists, galaxies):
+            with self.subTest(galaxy_dist=galaxy_dist):
+                log.debug("=== Testing Galaxy distribution level %d ===", galaxy_dist)
 
-                # Publish cluster
-                source_instance.publish_galaxy_cluster(cluster.uuid)
-                cluster_uuids[cluster_dist] = cluster.uuid
+                # Create 4 clusters with distribution levels 0,1,2,3
+                clusters = [
+                    create_galaxy_cluster(f"Cluster Dist {cluster_dist} for Galaxy {galaxy_dist}", cluster_dist, CLUSTER_DESCRIPTIONS[cluster_dist])
+                    for cluster_dist in range(4)
+                ]
 
-            time.sleep(2)  # allow sync
+                # Add and publish the clusters
+                add_published_galaxy_clusters(source_instance, new_galaxy, clusters)
+                cluster_uuids = {cluster.distribution: cluster.uuid for cluster in clusters}
 
-            # Perform the pull on the target
-            pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
-            time.sleep(5)  # Allow time for pull to complete
-            check_response(pull_result)
+                # Perform the pull on the target
+                pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
+                check_response(pull_result)
 
-            # Retrieve galaxy with its clusters
-            target_galaxy = target_instance.get_galaxy(new_galaxy, withCluster=True, pythonify=True)
-
-            # For galaxies with dist 0 or 1, the galaxy itself should not be visible
-            if galaxy_dist == 0:
-                self.assertTrue(isinstance(target_galaxy, dict) and "errors" in target_galaxy, f"Galaxy should NOT propagate for galaxy dist {galaxy_dist}, but found {target_galaxy}")
-            elif galaxy_dist == 1:
-                self.assertIsNotNone(target_galaxy, f"Galaxy should propagate for galaxy dist {galaxy_dist}, but found None")
-                clusters = misps_site_admin[target_index - 1].search_galaxy_clusters(target_galaxy, pythonify=True)
-                found_uuids = {c.uuid for c in clusters} if clusters else set()
-                self.assertNotIn(cluster_uuids[0], found_uuids, f"Cluster dist 0 (uuid={cluster_uuids[0]}) should NOT propagate for galaxy with dist {galaxy_dist}")
-                self.assertIn(cluster_uuids[1], found_uuids, f"Cluster dist 1 (uuid={cluster_uuids[1]}) should propagate for galaxy with dist {galaxy_dist}")
-                self.assertIn(cluster_uuids[2], found_uuids, f"Cluster dist 2 (uuid={cluster_uuids[2]}) should propagate for galaxy with dist {galaxy_dist}")
-                self.assertIn(cluster_uuids[3], found_uuids, f"Cluster dist 3 (uuid={cluster_uuids[3]}) should propagate for galaxy with dist {galaxy_dist}")
-            elif galaxy_dist in (2, 3):
-                self.assertIsNotNone(target_galaxy, f"Galaxy should propagate for galaxy dist {galaxy_dist}, but found None")
-                clusters = misps_site_admin[target_index - 1].search_galaxy_clusters(target_galaxy, pythonify=True)
-                found_uuids = {c.uuid for c in clusters} if clusters else set()
-                # Only clusters dist 2 and 3 must propagate
-                self.assertNotIn(cluster_uuids[0], found_uuids, f"Cluster dist 0 (uuid={cluster_uuids[0]}) should NOT propagate for galaxy with dist {galaxy_dist}")
-                self.assertNotIn(cluster_uuids[1], found_uuids, f"Cluster dist 1 (uuid={cluster_uuids[1]}) should NOT propagate for galaxy with dist {galaxy_dist}")
-                self.assertIn(cluster_uuids[2], found_uuids, f"Cluster dist 2 (uuid={cluster_uuids[2]}) should propagate for galaxy with dist {galaxy_dist}")
-                self.assertIn(cluster_uuids[3], found_uuids, f"Cluster dist 3 (uuid={cluster_uuids[3]}) should propagate for galaxy with dist {galaxy_dist}")
+                # Retrieve galaxy with its clusters
+                target_galaxy = wait_for(lambda: target_instance.get_galaxy(new_galaxy, withCluster=True, pythonify=True), is_found,
+                                         timeout=ABSENCE_TIMEOUT if galaxy_dist == 0 else SYNC_TIMEOUT)
 
+                # For galaxies with dist 0 or 1, the galaxy itself should not be visible
+                if galaxy_dist == 0:
+                    self.assertTrue(isinstance(target_galaxy, dict) and "errors" in target_galaxy, f"Galaxy should NOT propagate for galaxy dist {galaxy_dist}, but found {target_galaxy}")
+                elif galaxy_dist == 1:
+                    self.assertIsNotNone(target_galaxy, f"Galaxy should propagate for galaxy dist {galaxy_dist}, but found None")
+                    expected_uuids = {cluster_uuids[1], cluster_uuids[2], cluster_uuids[3]}
+                    unexpected_uuids = {cluster_uuids[0]}
+                    found_uuids = wait_for(lambda: uuid_set(misps_site_admin[target_index - 1].search_galaxy_clusters(target_galaxy, pythonify=True)),
+                                           lambda found: expected_uuids <= found)
+                    self.assertFalse(found_uuids & unexpected_uuids, f"Clusters {sorted(found_uuids & unexpected_uuids)} should NOT propagate for galaxy with dist {galaxy_dist}")
+                    self.assertEqual(found_uuids & expected_uuids, expected_uuids, f"Clusters {sorted(expected_uuids - found_uuids)} should propagate for galaxy with dist {galaxy_dist}")
+                elif galaxy_dist in (2, 3):
+                    self.assertIsNotNone(target_galaxy, f"Galaxy should propagate for galaxy dist {galaxy_dist}, but found None")
+                    # Only clusters dist 2 and 3 must propagate
+                    expected_uuids = {cluster_uuids[2], cluster_uuids[3]}
+                    unexpected_uuids = {cluster_uuids[0], cluster_uuids[1]}
+                    found_uuids = wait_for(lambda: uuid_set(misps_site_admin[target_index - 1].search_galaxy_clusters(target_galaxy, pythonify=True)),
+                                           lambda found: expected_uuids <= found)
+                    self.assertFalse(found_uuids & unexpected_uuids, f"Clusters {sorted(found_uuids & unexpected_uuids)} should NOT propagate for galaxy with dist {galaxy_dist}")
+                    self.assertEqual(found_uuids & expected_uuids, expected_uuids, f"Clusters {sorted(expected_uuids - found_uuids)} should propagate for galaxy with dist {galaxy_dist}")
 
     def testGalaxyDowngradeDistributionLevelOnPush(self):
         """
@@ -554,69 +404,49 @@ class TestDistributionLevel(unittest.TestCase):
         """
         source_instance = misps_org_admin[0]
 
-        for galaxy_dist in [2, 3]:
-            galaxy_name = f"Galaxy Dist {galaxy_dist} with Cluster Dist 2"
-            print(f"\n=== Testing downgrade for Galaxy distribution {galaxy_dist} ===")
-
-            # Create galaxy
-            source_instance._check_response(source_instance._prepare_request(
-                'POST',
-                '/galaxies/add',
-                data={
-                    'name': galaxy_name,
-                    'namespace': 'MISP Test',
-                    'distribution': galaxy_dist,
-                    'description': f'Test downgrade of galaxy dist {galaxy_dist}'
-                }
-            ))
-            new_galaxy = source_instance.galaxies(pythonify=True)[-1]
-
-            # Create cluster with distribution=2
-            cluster_uuid = str(UUID.uuid4())
-            cluster = MISPGalaxyCluster()
-            cluster.uuid = cluster_uuid
-            cluster.value = f"Cluster Dist 2 for Galaxy {galaxy_dist}"
-            cluster.authors = ["CIRCL"]
-            cluster.distribution = 2
-            cluster.description = "Cluster with distribution 2"
-
-            source_instance.add_galaxy_cluster(new_galaxy, cluster, pythonify=True)
-            source_instance.publish_galaxy_cluster(cluster.uuid)
-
-            time.sleep(2)  # allow sync
-
-            # Get servers connected to source
-            servers = misps_site_admin[0].servers()
-            servers_id = get_servers_id(servers)
-            if not servers_id:
-                raise Exception("No server configuration found for the source instance")
-
-            linked_server_numbers = extract_server_numbers(servers)
-
-            # Check galaxy distribution on remote instances
-            for target_index in linked_server_numbers:
-                target_instance = misps_site_admin[target_index - 1]
+        # Get the server configurations linked to this instance
+        servers_id = self.servers_id
+        if not servers_id:
+            raise Exception("No server configuration found for the source instance")
+
+        # Create the galaxies of every tested distribution level concurrently
+        galaxy_dists = [2, 3]
+        galaxies = parallel_map(
+            lambda galaxy_dist: add_galaxy(source_instance, f"Galaxy Dist {galaxy_dist} with Cluster Dist 2", galaxy_dist, f'Test downgrade of galaxy dist {galaxy_dist}'),
+            galaxy_dists)
 
-                # Retrieve galaxy on target
-                target_galaxy = target_instance.get_galaxy(new_galaxy, pythonify=True)
+        for galaxy_dist, new_galaxy in zip(galaxy_dists, galaxies):
+            with self.subTest(galaxy_dist=galaxy_dist):
+                log.debug("=== Testing downgrade for Galaxy distribution %d ===", galaxy_dist)
 
-                print(f"On MISP_{target_index}, Galaxy {target_galaxy.uuid} has dist={target_galaxy.distribution}")
+                # Create cluster with distribution=2
+                cluster = create_galaxy_cluster(f"Cluster Dist 2 for Galaxy {galaxy_dist}", 2, CLUSTER_DESCRIPTIONS[2])
 
-                if galaxy_dist == 2:
-                    # Expect downgrade to dist=1
-                    self.assertEqual(
-                        target_galaxy.distribution,
-                        1,
-                        f"Galaxy dist 2 with cluster dist 2 should downgrade to dist 1 on MISP_{target_index}"
-                    )
-                elif galaxy_dist == 3:
-                    # Expect galaxy stays at dist=3
-                    self.assertEqual(
-                        target_galaxy.distribution,
-                        3,
-                        f"Galaxy dist 3 with cluster dist 2 should remain dist 3 on MISP_{target_index}"
-                    )
+                source_instance.add_galaxy_cluster(new_galaxy, cluster, pythonify=True)
+                source_instance.publish_galaxy_cluster(cluster.uuid)
 
+                # Check galaxy distribution on remote instances
+                # Retrieve galaxy on every target
+                target_galaxies = parallel_map(
+                    lambda target: wait_for(lambda: target[1].get_galaxy(new_galaxy, pythonify=True), is_found),
+                    self.linked_site_targets)
+                for (target_index, _), target_galaxy in zip(self.linked_site_targets, target_galaxies):
+                    log.debug("On MISP_%d, Galaxy %s has dist=%s", target_index, target_galaxy.uuid, target_galaxy.distribution)
+
+                    if galaxy_dist == 2:
+                        # Expect downgrade to dist=1
+                        self.assertEqual(
+                            target_galaxy.distribution,
+                            1,
+                            f"Galaxy dist 2 with cluster dist 2 should downgrade to dist 1 on MISP_{target_index}"
+                        )
+                    elif galaxy_dist == 3:
+                        # Expect galaxy stays at dist=3
+                        self.assertEqual(
+                            target_galaxy.distribution,
+                            3,
+                            f"Galaxy dist 3 with cluster dist 2 should remain dist 3 on MISP_{target_index}"
+                        )
 
     def testGalaxyDowngradeDistributionLevelOnPull(self):
         """
@@ -626,71 +456,53 @@ class TestDistributionLevel(unittest.TestCase):
         - Galaxy dist=3 -> Galaxy should remain dist=3 on remote servers
         """
         # Find unidirectional link
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
-        print(f"Pulling from MISP_{source_index} on MISP_{target_index}")
-
-        for galaxy_dist in [1, 2, 3]:
-            galaxy_name = f"Galaxy Dist {galaxy_dist} for Pull Downgrade"
-            print(f"\n=== Testing downgrade for Galaxy distribution {galaxy_dist} ===")
-
-            # Create galaxy
-            source_instance._check_response(source_instance._prepare_request(
-                'POST',
-                '/galaxies/add',
-                data={
-                    'name': galaxy_name,
-                    'namespace': 'MISP Test',
-                    'distribution': galaxy_dist,
-                    'description': f'Test downgrade of galaxy dist {galaxy_dist}'
-                }
-            ))
-            new_galaxy = source_instance.galaxies(pythonify=True)[-1]
-
-            # Create cluster with distribution=2
-            cluster_uuid = str(UUID.uuid4())
-            cluster = MISPGalaxyCluster()
-            cluster.uuid = cluster_uuid
-            cluster.value = f"Cluster Dist 2 for Galaxy {galaxy_dist}"
-            cluster.authors = ["CIRCL"]
-            cluster.distribution = 2
-            cluster.description = "Cluster with distribution 2"
-            source_instance.add_galaxy_cluster(new_galaxy, cluster, pythonify=True)
-            source_instance.publish_galaxy_cluster(cluster.uuid)
-
-            time.sleep(2)  # allow sync
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
+        log.debug("Pulling from MISP_%d on MISP_%d", source_index, target_index)
 
-            # Perform the pull on the target
-            pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
-            time.sleep(5)  # Allow time for pull to complete
-            check_response(pull_result)
+        # Create the galaxies of every tested distribution level concurrently
+        galaxy_dists = [1, 2, 3]
+        galaxies = parallel_map(
+            lambda galaxy_dist: add_galaxy(source_instance, f"Galaxy Dist {galaxy_dist} for Pull Downgrade", galaxy_dist, f'Test downgrade of galaxy dist {galaxy_dist}'),
+            galaxy_dists)
 
-            # Retrieve galaxy on target
-            target_galaxy = target_instance.get_galaxy(new_galaxy, pythonify=True)
-            print(f"On MISP_{target_index}, Galaxy {getattr(target_galaxy, 'uuid', None)} has dist={getattr(target_galaxy, 'distribution', None)}")
+        for galaxy_dist, new_galaxy in zip(galaxy_dists, galaxies):
+            with self.subTest(galaxy_dist=galaxy_dist):
+                log.debug("=== Testing downgrade for Galaxy distribution %d ===", galaxy_dist)
 
-            if galaxy_dist == 1:
-                # Should downgrade to dist=0
-                self.assertEqual(
-                    target_galaxy.distribution,
-                    0,
-                    f"Galaxy dist 1 should downgrade to dist 0 on MISP_{target_index}"
-                )
-            elif galaxy_dist == 2:
-                # Should downgrade to dist=1
-                self.assertEqual(
-                    target_galaxy.distribution,
-                    1,
-                    f"Galaxy dist 2 should downgrade to dist 1 on MISP_{target_index}"
-                )
-            elif galaxy_dist == 3:
-                # Should remain dist=3
-                self.assertEqual(
-                    target_galaxy.distribution,
-                    3,
-                    f"Galaxy dist 3 should remain dist 3 on MISP_{target_index}"
-                )
+                # Create cluster with distribution=2
+                cluster = create_galaxy_cluster(f"Cluster Dist 2 for Galaxy {galaxy_dist}", 2, CLUSTER_DESCRIPTIONS[2])
+                source_instance.add_galaxy_cluster(new_galaxy, cluster, pythonify=True)
+                source_instance.publish_galaxy_cluster(cluster.uuid)
 
+                # Perform the pull on the target
+                pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
+                check_response(pull_result)
 
+                # Retrieve galaxy on target
+                target_galaxy = wait_for(lambda: target_instance.get_galaxy(new_galaxy, pythonify=True), is_found)
+                log.debug("On MISP_%d, Galaxy %s has dist=%s", target_index, getattr(target_galaxy, 'uuid', None), getattr(target_galaxy, 'distribution', None))
+
+                if galaxy_dist == 1:
+                    # Should downgrade to dist=0
+                    self.assertEqual(
+                        target_galaxy.distribution,
+                        0,
+                        f"Galaxy dist 1 should downgrade to dist 0 on MISP_{target_index}"
+                    )
+                elif galaxy_dist == 2:
+                    # Should downgrade to dist=1
+                    self.assertEqual(
+                        target_galaxy.distribution,
+                        1,
+                        f"Galaxy dist 2 should downgrade to dist 1 on MISP_{target_index}"
+                    )
+                elif galaxy_dist == 3:
+                    # Should remain dist=3
+                    self.assertEqual(
+                        target_galaxy.distribution,
+                        3,
+                        f"Galaxy dist 3 should remain dist 3 on MISP_{target_index}"
+                    )
 
     def testGalaxyClusterDowngradeDistributionOnPush(self):
         """
@@ -701,76 +513,51 @@ class TestDistributionLevel(unittest.TestCase):
         # Use the first MISP instance as source
         source_instance = misps_org_admin[0]
 
+        # Get the server configurations linked to this instance
+        servers_id = self.servers_id
+        if not servers_id:
+            raise Exception("No server configuration found for the source instance")
+
         # Create a galaxy (not implemented in PyMisp)
-        source_instance._check_response(source_instance._prepare_request(
-            'POST',
-            '/galaxies/add',
-            data={
-                'name': 'Galaxy for Push',
-                'namespace': 'MISP Test',
-                'distribution': 2,
-                'description': 'testGalaxyClusterDowngradeDistributionOnPush'
-            }
-        ))
-        new_galaxy = source_instance.galaxies(pythonify=True)[-1]
+        new_galaxy = add_galaxy(source_instance, 'Galaxy for Push', 2, 'testGalaxyClusterDowngradeDistributionOnPush')
 
         # Create a galaxy cluster with distribution 2
-        first_uuid = str(UUID.uuid4())
-        first_galaxy_cluster: MISPGalaxyCluster = MISPGalaxyCluster()
-        first_galaxy_cluster.uuid = first_uuid
-        first_galaxy_cluster.value = "Cluster for Push"
-        first_galaxy_cluster.authors = ["CIRCL"]
-        first_galaxy_cluster.distribution = 2
-        first_galaxy_cluster.description = "A cluster description"
-        source_instance.add_galaxy_cluster(new_galaxy, first_galaxy_cluster, pythonify=True)
-
-        # Publish the galaxy cluster
-        source_instance.publish_galaxy_cluster(first_uuid)
-        time.sleep(2)
+        first_galaxy_cluster: MISPGalaxyCluster = create_galaxy_cluster("Cluster for Push", 2, "A cluster description")
+        first_uuid = first_galaxy_cluster.uuid
 
         # Create a galaxy cluster with distribution 3
-        second_uuid = str(UUID.uuid4())
-        second_galaxy_cluster: MISPGalaxyCluster = MISPGalaxyCluster()
-        second_galaxy_cluster.uuid = second_uuid
-        second_galaxy_cluster.value = "Cluster for Push"
-        second_galaxy_cluster.authors = ["CIRCL"]
-        second_galaxy_cluster.distribution = 3
-        second_galaxy_cluster.description = "A cluster description"
-        source_instance.add_galaxy_cluster(new_galaxy, second_galaxy_cluster, pythonify=True)
-
-        # Publish the galaxy cluster
-        source_instance.publish_galaxy_cluster(second_uuid)
-        time.sleep(2)
+        second_galaxy_cluster: MISPGalaxyCluster = create_galaxy_cluster("Cluster for Push", 3, "A cluster description")
+        second_uuid = second_galaxy_cluster.uuid
 
-        # Get the server configurations linked to this instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
-        if not servers_id:
-            raise Exception("No server configuration found for the source instance")
+        # Add and publish the galaxy clusters
+        add_published_galaxy_clusters(source_instance, new_galaxy, [first_galaxy_cluster, second_galaxy_cluster])
 
         # Check for the presence of the galaxy cluster in all linked servers
-        linked_server_numbers = extract_server_numbers(servers)
-        for target_index in linked_server_numbers:
-            target_instance = misps_site_admin[target_index -1]
-            target_galaxy = target_instance.get_galaxy(new_galaxy, pythonify=True)
-            clusters = target_instance.search_galaxy_clusters(target_galaxy, pythonify=True)
-            first_cluster = next((c for c in clusters if c.uuid == first_uuid), None)
-            second_cluster = next((c for c in clusters if c.uuid == second_uuid), None)
-
-            if first_galaxy_cluster.distribution == 2:
-                # Should downgrade to dist=1
-                self.assertEqual(
-                    first_cluster.distribution,
-                    1,
-                    f"Galaxy cluster dist 2 should downgrade to dist 1 on MISP_{target_index}"
-                )
-            elif second_galaxy_cluster.distribution == 3:
-                # Should remain dist=3
-                self.assertEqual(
-                    second_cluster.distribution,
-                    3,
-                    f"Galaxy cluster dist 3 should remain dist 3 on MISP_{target_index}"
-               )
+        def fetch_target_clusters(target):
+            _, target_instance = target
+            target_galaxy = wait_for(lambda: target_instance.get_galaxy(new_galaxy, pythonify=True), is_found)
+            return wait_for(lambda: target_instance.search_galaxy_clusters(target_galaxy, pythonify=True),
+                            lambda clusters: {first_uuid, second_uuid} <= uuid_set(clusters))
+
+        for (target_index, _), clusters in zip(self.linked_site_targets, parallel_map(fetch_target_clusters, self.linked_site_targets)):
+            clusters_by_uuid = {c.uuid: c for c in clusters}
+            first_cluster = clusters_by_uuid.get(first_uuid)
+            second_cluster = clusters_by_uuid.get(second_uuid)
+
+            # Cluster dist=2 should downgrade to dist=1
+            self.assertIsNotNone(first_cluster, f"Cluster with dist=2 not found on MISP_{target_index} after push")
+            self.assertEqual(
+                first_cluster.distribution,
+                1,
+                f"Galaxy cluster dist 2 should downgrade to dist 1 on MISP_{target_index}"
+            )
+            # Cluster dist=3 should remain dist=3
+            self.assertIsNotNone(second_cluster, f"Cluster with dist=3 not found on MISP_{target_index} after push")
+            self.assertEqual(
+                second_cluster.distribution,
+                3,
+                f"Galaxy cluster dist 3 should remain dist 3 on MISP_{target_index}"
+            )
 
     def testGalaxyClusterDowngradeDistributionOnPull(self):
         """
@@ -780,77 +567,41 @@ class TestDistributionLevel(unittest.TestCase):
         - Cluster dist=3 -> Cluster should remain dist=3 on remote servers
         """
         # Find unidirectional link
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
-        print(f"Pulling from MISP_{source_index} on MISP_{target_index}")
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
+        log.debug("Pulling from MISP_%d on MISP_%d", source_index, target_index)
 
         # Create a galaxy (not implemented in PyMisp)
-        source_instance._check_response(source_instance._prepare_request(
-            'POST',
-            '/galaxies/add',
-            data={
-                'name': 'Galaxy for Pull',
-                'namespace': 'MISP Test',
-                'distribution': 2,
-                'description': 'testGalaxyClusterDowngradeDistributionOnPull'
-            }
-        ))
-        new_galaxy = source_instance.galaxies(pythonify=True)[-1]
+        new_galaxy = add_galaxy(source_instance, 'Galaxy for Pull', 2, 'testGalaxyClusterDowngradeDistributionOnPull')
 
         # Create a galaxy cluster with distribution 1
-        first_uuid = str(UUID.uuid4())
-        first_galaxy_cluster: MISPGalaxyCluster = MISPGalaxyCluster()
-        first_galaxy_cluster.uuid = first_uuid
-        first_galaxy_cluster.value = "Cluster for Pull"
-        first_galaxy_cluster.authors = ["CIRCL"]
-        first_galaxy_cluster.distribution = 1
-        first_galaxy_cluster.description = "A cluster description"
-        source_instance.add_galaxy_cluster(new_galaxy, first_galaxy_cluster, pythonify=True)
-
-        # Publish the galaxy cluster
-        source_instance.publish_galaxy_cluster(first_uuid)
-        time.sleep(2)
+        first_galaxy_cluster: MISPGalaxyCluster = create_galaxy_cluster("Cluster for Pull", 1, "A cluster description")
+        first_uuid = first_galaxy_cluster.uuid
 
         # Create a galaxy cluster with distribution 2
-        second_uuid = str(UUID.uuid4())
-        second_galaxy_cluster: MISPGalaxyCluster = MISPGalaxyCluster()
-        second_galaxy_cluster.uuid = second_uuid
-        second_galaxy_cluster.value = "Cluster for Pull"
-        second_galaxy_cluster.authors = ["CIRCL"]
-        second_galaxy_cluster.distribution = 2
-        second_galaxy_cluster.description = "A cluster description"
-        source_instance.add_galaxy_cluster(new_galaxy, second_galaxy_cluster, pythonify=True)
-
-        # Publish the galaxy cluster
-        source_instance.publish_galaxy_cluster(second_uuid)
-        time.sleep(2)
+        second_galaxy_cluster: MISPGalaxyCluster = create_galaxy_cluster("Cluster for Pull", 2, "A cluster description")
+        second_uuid = second_galaxy_cluster.uuid
 
         # Create a galaxy cluster with distribution 3
-        third_uuid = str(UUID.uuid4())
-        third_galaxy_cluster: MISPGalaxyCluster = MISPGalaxyCluster()
-        third_galaxy_cluster.uuid = third_uuid
-        third_galaxy_cluster.value = "Cluster for Pull"
-        third_galaxy_cluster.authors = ["CIRCL"]
-        third_galaxy_cluster.distribution = 3
-        third_galaxy_cluster.description = "A cluster description"
-        source_instance.add_galaxy_cluster(new_galaxy, third_galaxy_cluster, pythonify=True)
-
-        # Publish the galaxy cluster
-        source_instance.publish_galaxy_cluster(third_uuid)
-        time.sleep(2)
+        third_galaxy_cluster: MISPGalaxyCluster = create_galaxy_cluster("Cluster for Pull", 3, "A cluster description")
+        third_uuid = third_galaxy_cluster.uuid
+
+        # Add and publish the galaxy clusters
+        add_published_galaxy_clusters(source_instance, new_galaxy, [first_galaxy_cluster, second_galaxy_cluster, third_galaxy_cluster])
 
         # Perform the pull on the target
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
-        time.sleep(5)  # Allow time for pull to complete
         check_response(pull_result)
 
         # Retrieve galaxy and clusters on the target
-        target_galaxy = target_instance.get_galaxy(new_galaxy, withCluster=True, pythonify=True)
-        clusters = misps_site_admin[target_index - 1].search_galaxy_clusters(target_galaxy, pythonify=True)
+        target_galaxy = wait_for(lambda: target_instance.get_galaxy(new_galaxy, withCluster=True, pythonify=True), is_found)
+        clusters = wait_for(lambda: misps_site_admin[target_index - 1].search_galaxy_clusters(target_galaxy, pythonify=True),
+                            lambda clusters: {first_uuid, second_uuid, third_uuid} <= uuid_set(clusters))
 
         # Find clusters by uuid
-        first_cluster = next((c for c in clusters if c.uuid == first_uuid), None)
-        second_cluster = next((c for c in clusters if c.uuid == second_uuid), None)
-        third_cluster = next((c for c in clusters if c.uuid == third_uuid), None)
+        clusters_by_uuid = {c.uuid: c for c in clusters}
+        first_cluster = clusters_by_uuid.get(first_uuid)
+        second_cluster = clusters_by_uuid.get(second_uuid)
+        third_cluster = clusters_by_uuid.get(third_uuid)
 
         # Cluster dist=1 should downgrade to dist=0
         self.assertIsNotNone(first_cluster, "Cluster with dist=1 not found on target after pull")
@@ -874,7 +625,6 @@ class TestDistributionLevel(unittest.TestCase):
             f"Galaxy cluster dist 3 should remain dist 3 on MISP_{target_index}"
        )
 
-
     def testAnalystDataDistributionLevelOnPush(self):
         """
         Creates an event with distribution=3, adds 4 analyst data (dist 0 to 3),
@@ -883,58 +633,38 @@ class TestDistributionLevel(unittest.TestCase):
 
         source_instance = misps_org_admin[0]
 
-        # Create an event with distribution 3
-        event = create_event('Event for analyst data distribution')
-        event.distribution = 3
-        event = source_instance.add_event(event, pythonify=True)
-        check_response(event)
-        self.assertIsNotNone(event.id)
+        # Create an event with distribution 3, then create 4 analyst data (MISPNote) with distribution 0 to 3
+        event, notes = self._add_event_with_notes(source_instance, 'Event for analyst data distribution', range(4), "Some analyst content dist")
         uuid = event.uuid
 
-        # Create 4 analyst data (MISPNote) with distribution 0 to 3
-        notes = []
-        for dist in range(4):
-            note = MISPNote()
-            note.object_type = 'Event'
-            note.object_uuid = event.uuid
-            note.note = f"Some analyst content dist {dist}"
-            note.distribution = dist
-            source_instance.add_analyst_data(note, pythonify=True)
-            notes.append(note)
-
         # Publish the event (which also publishes the analyst data)
         publish_immediately(source_instance, event, with_email=True)
-        time.sleep(2)
 
         # Get the server configurations linked to this instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
+        servers_id = self.servers_id
         if not servers_id:
             raise Exception("No server configuration found for the source instance")
 
         # Push the event to each linked server (a push all is needed for analyst data)
-        for server_id in servers_id:
-            push_response = misps_site_admin[0].server_push(server=server_id)
-            time.sleep(2)
-            check_response(push_response)
+        push_to_servers(misps_site_admin[0], servers_id)
 
         # Verify on the target server
-        linked_server_numbers = extract_server_numbers(servers)
+        linked_server_numbers = self.linked_server_numbers
         if not linked_server_numbers:
             raise Exception("No linked server found")
         target_index = linked_server_numbers[0]
         target_instance = misps_site_admin[target_index - 1]
         # Chercher l'event sur le serveur cible
-        search_results = target_instance.search(uuid=uuid)
+        search_results = wait_for(lambda: search_meta(target_instance, uuid))
         self.assertGreater(len(search_results), 0, "Event not found on target instance")
 
-
-        # Fetch  analyst data from the target server via get_analyst_data
-        analyst_data_dist = [
+        # Fetch analyst data from the target server along with the event
+        target_notes = wait_for(lambda: event_notes(target_instance, uuid), lambda found: {note.uuid for note in notes[2:]} <= found.keys())
+        analyst_data_dist = {
             element.note
             for element in notes
-            if target_instance.get_analyst_data(element, pythonify=True) is not None
-        ]
+            if element.uuid in target_notes
+        }
 
         # Verify that dist 0 and 1 are not present, dist 2 and 3 are
         self.assertNotIn("Some analyst content dist 0", analyst_data_dist, "Analyst data dist 0 should NOT be present on target")
@@ -943,73 +673,52 @@ class TestDistributionLevel(unittest.TestCase):
         self.assertIn("Some analyst content dist 3", analyst_data_dist, "Analyst data dist 3 should be present on target")
 
         # If the target server has servers of its own, check for level 3 propagation
-        servers2 = misps_site_admin[target_index - 1].servers()
+        servers2 = cached_servers(target_index - 1)
         servers2_id = get_servers_id(servers2)
         if servers2_id:
             linked2 = extract_server_numbers(servers2)
             target2_index = linked2[0]
             target2_instance = misps_org_admin[target2_index - 1]
-            search2 = target2_instance.search(uuid=uuid)
+            search2 = wait_for(lambda: search_meta(target2_instance, uuid))
             self.assertGreater(len(search2), 0, "Event not found on second-level target")
 
-            analyst_data_dist2 = [
+            target2_notes = wait_for(lambda: event_notes(target2_instance, uuid), lambda found: notes[3].uuid in found)
+            analyst_data_dist2 = {
                 element.note
                 for element in notes
-                if target2_instance.get_analyst_data(element, pythonify=True) is not None
-            ]
+                if element.uuid in target2_notes
+            }
 
             self.assertNotIn("Some analyst content dist 0", analyst_data_dist2, "Analyst data dist 0 should NOT be present on second-level target")
             self.assertNotIn("Some analyst content dist 1", analyst_data_dist2, "Analyst data dist 1 should NOT be present on second-level target")
             self.assertNotIn("Some analyst content dist 2", analyst_data_dist2, "Analyst data dist 2 should NOT be present on second-level target")
             self.assertIn("Some analyst content dist 3", analyst_data_dist2, "Analyst data dist 3 should be present on second-level target")
 
-        # Cleanup
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
-
-
     def testAnalystDataDistributionLevelOnPull(self):
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
-        print(f"Pulling Analyst Data from MISP_{source_index} on MISP_{target_index}")
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
+        log.debug("Pulling Analyst Data from MISP_%d on MISP_%d", source_index, target_index)
 
-        # Create an event with distribution 3 on the source
-        event = create_event('Event for analyst data pull')
-        event.distribution = 3
-        event = source_instance.add_event(event, pythonify=True)
-        check_response(event)
-        self.assertIsNotNone(event.id)
+        # Create an event with distribution 3, then create 4 analyst data (MISPNote) with distribution 0 to 3
+        event, notes = self._add_event_with_notes(source_instance, 'Event for analyst data pull', range(4), "Some analyst content dist")
         uuid = event.uuid
 
-        # Create 4 analyst data (MISPNote) with distribution 0 to 3
-        notes = []
-        for dist in range(4):
-            note = MISPNote()
-            note.object_type = 'Event'
-            note.object_uuid = event.uuid
-            note.note = f"Some analyst content dist {dist}"
-            note.distribution = dist
-            source_instance.add_analyst_data(note, pythonify=True)
-            notes.append(note)
-
         # Publish the event and the analyst data
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)
 
         # Pull on the target (a pull all is needed for analayst data)
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
-        time.sleep(5)
         check_response(pull_result)
 
         # Verify that the event is present on the target
-        search_results = target_instance.search(uuid=uuid)
+        search_results = wait_for(lambda: search_meta(target_instance, uuid))
         self.assertGreater(len(search_results), 0, f"Event not found on MISP_{target_index} after pull")
 
-        analyst_data_dist = [
+        target_notes = wait_for(lambda: event_notes(target_instance, uuid), lambda found: {note.uuid for note in notes[1:]} <= found.keys())
+        analyst_data_dist = {
             element.note
             for element in notes
-            if target_instance.get_analyst_data(element, pythonify=True) is not None
-        ]
+            if element.uuid in target_notes
+        }
 
         # Expected results
         self.assertNotIn("Some analyst content dist 0", analyst_data_dist, "Analyst data dist 0 should NOT be present on target")
@@ -1017,10 +726,6 @@ class TestDistributionLevel(unittest.TestCase):
         self.assertIn("Some analyst content dist 2", analyst_data_dist, "Analyst data dist 2 should be present on target")
         self.assertIn("Some analyst content dist 3", analyst_data_dist, "Analyst data dist 3 should be present on target")
 
-        # Cleanup
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
 
     
     def testAnalystDataDowngradeDistributionLevelOnPush(self):
@@ -1031,44 +736,23 @@ class TestDistributionLevel(unittest.TestCase):
         """
         source_instance = misps_org_admin[0]
 
-        # Create an event dist=3
-        event = create_event('Event for analyst data downgrade push')
-        event.distribution = 3
-        event = source_instance.add_event(event, pythonify=True)
-        check_response(event)
+        # Create an event with distribution 3, then add analyst data dist=2 and dist=3
+        event, notes = self._add_event_with_notes(source_instance, 'Event for analyst data downgrade push', [2, 3], "Analyst data push dist")
         uuid = event.uuid
-        self.assertIsNotNone(event.id)
-
-        # Add analyst data dist=2 and dist=3
-        notes = []
-        for dist in [2, 3]:
-            note = MISPNote()
-            note.object_type = 'Event'
-            note.object_uuid = event.uuid
-            note.note = f"Analyst data push dist {dist}"
-            note.distribution = dist
-            added = source_instance.add_analyst_data(note, pythonify=True)
-            check_response(added)
-            notes.append(note)
 
         # Publish the event and the analyst data
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)
 
         # Push to all linked servers (a push all is needed for analyst data)
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
-        for server_id in servers_id:
-            push_response = misps_site_admin[0].server_push(server=server_id)
-            time.sleep(2)
-            check_response(push_response)
-
-        # Verify downgrade on the targets
-        linked_server_numbers = extract_server_numbers(servers)
-        for target_index in linked_server_numbers:
-            target_instance = misps_site_admin[target_index - 1]
+        servers_id = self.servers_id
+        push_to_servers(misps_site_admin[0], servers_id)
+
+        # Verify downgrade on the targets, fetching the notes of every target concurrently
+        note_uuids = {note.uuid for note in notes}
+        notes_per_target = parallel_map(lambda target: wait_for(lambda: event_notes(target[1], uuid), lambda found: note_uuids <= found.keys()), self.linked_site_targets)
+        for (target_index, _), target_notes in zip(self.linked_site_targets, notes_per_target):
             for note in notes:
-                target_note = target_instance.get_analyst_data(note, pythonify=True)
+                target_note = target_notes.get(note.uuid)
                 self.assertIsNotNone(target_note, f"Analyst data dist {note.distribution} not found on MISP_{target_index}")
                 if note.distribution == 2:
                     self.assertEqual(int(target_note.distribution), 1,
@@ -1077,12 +761,6 @@ class TestDistributionLevel(unittest.TestCase):
                     self.assertEqual(int(target_note.distribution), 3,
                                     f"Analyst data dist 3 should remain dist 3 on MISP_{target_index}")
 
-        # Cleanup
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
-
-
     def testAnalystDataDowngradeDistributionLevelOnPull(self):
         """
         Tests the downgrade of the analyst data distribution during a pull.
@@ -1090,41 +768,25 @@ class TestDistributionLevel(unittest.TestCase):
         - Analyst data dist=2 must be downgraded to dist=1
         - Analyst data dist=3 must remain at dist=3
         """
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
-        print(f"Pulling Analyst Data from MISP_{source_index} on MISP_{target_index}")
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
+        log.debug("Pulling Analyst Data from MISP_%d on MISP_%d", source_index, target_index)
 
-        # Create an event dist=3
-        event = create_event(f"Event {source_index} for analyst data downgrade pull")
-        event.distribution = 3
-        event = source_instance.add_event(event, pythonify=True)
-        check_response(event)
+        # Create an event with distribution 3, then add analyst data dist=1, 2, 3
+        event, notes = self._add_event_with_notes(source_instance, f"Event {source_index} for analyst data downgrade pull", [1, 2, 3], "Analyst data pull dist")
         uuid = event.uuid
-        self.assertIsNotNone(event.id)
-
-        # Add analyst data dist=1, 2, 3
-        notes = []
-        for dist in [1, 2, 3]:
-            note = MISPNote()
-            note.object_type = 'Event'
-            note.object_uuid = event.uuid
-            note.note = f"Analyst data pull dist {dist}"
-            note.distribution = dist
-            added = source_instance.add_analyst_data(note, pythonify=True)
-            check_response(added)
-            notes.append(note)
 
         # Publish the event and the analyst data
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)
 
         # Pull on the target (a pull all is needed for analyst data)
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
-        time.sleep(5)
         check_response(pull_result)
 
         # Verify downgrade on the target
+        note_uuids = {note.uuid for note in notes}
+        target_notes = wait_for(lambda: event_notes(target_instance, uuid), lambda found: note_uuids <= found.keys())
         for note in notes:
-            target_note = target_instance.get_analyst_data(note, pythonify=True)
+            target_note = target_notes.get(note.uuid)
             self.assertIsNotNone(target_note, f"Analyst data dist {note.distribution} not found on MISP_{target_index}")
             if note.distribution == 1:
                 self.assertEqual(int(target_note.distribution), 0,
@@ -1136,8 +798,4 @@ class TestDistributionLevel(unittest.TestCase):
                 self.assertEqual(int(target_note.distribution), 3,
                                 f"Analyst data dist 3 should remain dist 3 on MISP_{target_index}")
 
-        # Cleanup
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
 
@@ -1,8 +1,12 @@
-import unittest
-import time
-from common import misps_site_admin, misps_org_admin, create_event, publish_immediately, check_response, get_servers_id, extract_server_numbers, find_unidirectional_link, purge_events_and_blocklists
+from common import misps_site_admin, misps_org_admin, cached_servers, create_event, publish_immediately, check_response, wait_for, parallel_map, search_meta, attribute_count_after_update, servers_info, SyncTestCase
+
+class TestLockedStatus(SyncTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The servers configured on the first instance do not change during the run
+        servers = cached_servers(0)
+        cls.servers_id, cls.linked_server_numbers = servers_info(servers)
 
-class TestLockedStatus(unittest.TestCase):
     def testLockedStatusOnPush(self):
         """
         Verifies that the 'locked' attribute of an event is correctly set to True when the event is pushed.
@@ -19,22 +23,21 @@ class TestLockedStatus(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Publish the event immediately to propagate it to linked instances
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Allow time for synchronization to complete
 
-        # Retrieve the server configurations linked to the source instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
+        # Check the server configurations linked to the source instance
+        servers_id = self.servers_id
         if not servers_id:
             raise Exception("No server configuration found for the source instance")
 
         # For each linked target instance, verify that the event exists and is locked
-        linked_server_numbers = extract_server_numbers(servers)
-        for target_index in linked_server_numbers:
-            target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
+        linked_server_numbers = self.linked_server_numbers
+        # The locked flag is part of the event metadata, there is no need to fetch the attributes
+        results_per_target = parallel_map(lambda target_index: wait_for(lambda: search_meta(misps_org_admin[target_index - 1], uuid)), linked_server_numbers)
+        for target_index, search_results in zip(linked_server_numbers, results_per_target):
             self.assertGreater(
                 len(search_results), 0,
                 f"Event not found on MISP_{target_index} after push"
@@ -43,23 +46,22 @@ class TestLockedStatus(unittest.TestCase):
                 self.assertTrue(result['Event']['locked'], f"Event on MISP_{target_index} is not locked")
 
         # Attempt to update the event on each target instance and verify that modification is not allowed
-        for target_index in linked_server_numbers:
+        def try_update(target_index):
             target_instance = misps_org_admin[target_index - 1]
             # Try to add an attribute to the locked event
             event_to_update = target_instance.get_event(event, pythonify=True)
+            attribute_count = len(event_to_update.attributes)
             event_to_update.add_attribute('text', 'This should not be allowed')
-            target_instance.update_event(event_to_update, pythonify=True)
-            # Ensure the event was not modified (should still have only one attribute)
-            updated_event = target_instance.search(uuid=uuid)
-            self.assertNotEqual(
-                len(updated_event[0]['Event']['Attribute']), 2,
+            return attribute_count, attribute_count_after_update(target_instance, event_to_update)
+
+        updated_counts = parallel_map(try_update, linked_server_numbers)
+        for target_index, (attribute_count, updated_count) in zip(linked_server_numbers, updated_counts):
+            # Ensure the event was not modified: the update is either rejected or leaves the attributes it had before
+            self.assertIn(
+                updated_count, (None, attribute_count),
                 f"Event on MISP_{target_index} was modified despite being locked"
             )
 
-        # Cleanup: remove all test events and blocklists from all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
 
     def testLockedStatusOnPull(self):
         """
@@ -67,7 +69,7 @@ class TestLockedStatus(unittest.TestCase):
         Ensures that the event cannot be modified on the target MISP instance after synchronization.
         """
         # Find a unidirectional synchronization link between two instances
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
         print(f"Unidirectional link: {source_index} --> {target_index}")
 
         # Create a new event on the source instance
@@ -77,37 +79,28 @@ class TestLockedStatus(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Publish the event immediately to make it available for pulling
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Allow time for synchronization to complete
-
-        # Publish the event again to ensure propagation
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Allow time for synchronization to complete
 
         # Perform the pull operation on the target instance
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id, event=event.id)
-        time.sleep(2)  # Allow time for the pull to complete
         check_response(pull_result)
 
         # Verify that the event exists and is locked on the target instance
-        results = target_instance.search(uuid=uuid)
+        results = wait_for(lambda: search_meta(target_instance, uuid))
         self.assertGreater(len(results), 0, f"Event not found on MISP_{target_index} after pull")
         for result in results:
             self.assertTrue(result['Event']['locked'], f"Event on MISP_{target_index} is not locked")
 
         # Attempt to update the event on the target instance and verify that modification is not allowed
         event_to_update = target_instance.get_event(event, pythonify=True)
+        attribute_count = len(event_to_update.attributes)
         event_to_update.add_attribute('text', 'This should not be allowed')
-        target_instance.update_event(event_to_update, pythonify=True)
-        # Ensure the event was not modified (should still have only one attribute)
-        updated_event = target_instance.search(uuid=uuid)
-        self.assertNotEqual(
-            len(updated_event[0]['Event']['Attribute']), 2,
+        updated_count = attribute_count_after_update(target_instance, event_to_update)
+        # Ensure the event was not modified: the update is either rejected or leaves the attributes it had before
+        self.assertIn(
+            updated_count, (None, attribute_count),
             f"Event on MISP_{target_index} was modified despite being locked"
         )
-
-        # Cleanup: remove all test events and blocklists from all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
@@ -1,128 +1,161 @@
-import unittest
-import time
-import uuid as UUID
-from common import misps_site_admin, misps_org_admin, create_event, publish_immediately, request, check_response, get_servers_id, extract_server_numbers, find_unidirectional_link, purge_events_and_blocklists
-from pymisp import PyMISP, MISPSighting, MISPNote, MISPGalaxy, MISPGalaxyCluster
-from pymisp.api import get_uuid_or_id_from_abstract_misp
-
-class TestSyncMethodsEnabled(unittest.TestCase):
-    def testSyncSightingsOnPush(self):
+from common import misps_site_admin, misps_org_admin, cached_servers, create_event, publish_immediately, request, check_response, wait_for, is_found, find_sighting, parallel_map, push_to_servers, create_galaxy_cluster, add_published_galaxy_clusters, add_galaxy, has_note, servers_info, SyncTestCase
+from pymisp import PyMISP, MISPSighting, MISPNote, MISPGalaxy
+
+# Source of the test sightings and text of the test notes, looked for on the targets
+SIGHTING_SOURCE = 'SyncTest'
+NOTE_TEXT = 'Test analyst note'
+
+
+class TestSyncMethodsEnabled(SyncTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The servers configured on the first instance do not change during the run
+        servers = cached_servers(0)
+        cls.servers_id, cls.linked_server_numbers = servers_info(servers)
+        # Organisation of the org admin of each source instance, keyed by connector, loaded once per class
+        cls._source_orgs = {}
+        cls._source_org(misps_org_admin[0])
+
+    @classmethod
+    def _source_org(cls, source_instance):
         """
-        Checks that sightings are properly synchronized when an event is pushed.
+        Return the organisation of the user of the given instance as the {'uuid', 'name'} dict a sighting payload takes.
+        The push tests start from the first instance, which is loaded in setUpClass; the source of the pull link is loaded on first use.
         """
-        # Use the first MISP instance as the source
-        source_instance = misps_org_admin[0]
+        if source_instance not in cls._source_orgs:
+            organisation = source_instance.get_organisation(source_instance.get_user(pythonify=True).org_id, pythonify=True)
+            check_response(organisation)
+            cls._source_orgs[source_instance] = {'uuid': organisation.uuid, 'name': organisation.name}
+        return cls._source_orgs[source_instance]
 
-        # Create an event and add an attribute
-        event = create_event('Event for sightings sync on push')
+    def _add_published_event(self, source_instance, name, sightings=()):
+        """
+        Create an event shared with connected communities on the source instance, carrying the given sightings on its first attribute, and publish it.
+        """
+        event = create_event(name, sightings=sightings)
         event.distribution = 2
         event = source_instance.add_event(event, pythonify=True)
         check_response(event)
         self.assertIsNotNone(event.id)
-        uuid = event.uuid
+        self._track(event.uuid)
+        # Check on the source that the sightings were captured, rather than waiting for them on the targets
+        captured_sources = {sighting.source for sighting in event.attributes[0].sightings}
+        for sighting in sightings:
+            self.assertIn(sighting.source, captured_sources, "Sighting not captured on the source instance")
+        publish_immediately(source_instance, event, with_email=False)
+        return event
 
-        # Add a sighting to the first attribute
-        attr_id = event.attributes[0].id
+    def _add_published_event_with_sighting(self, source_instance, name):
+        """
+        Create and publish an event whose first attribute carries a sighting from SIGHTING_SOURCE.
+        Returns the UUID of the event and the ID of the sighted attribute.
+        """
         sighting = MISPSighting()
-        sighting.value = event.attributes[0].value
-        sighting.source = 'SyncTest'
+        sighting.source = SIGHTING_SOURCE
         sighting.type = '0'
-        r = source_instance.add_sighting(sighting, event.attributes[0], pythonify=True)
-        self.assertEqual(r.source, 'SyncTest')
+        # Unlike /sightings/add, an event payload only attributes its sightings to the organisation it names
+        sighting.Organisation = self._source_org(source_instance)
+        event = self._add_published_event(source_instance, name, sightings=[sighting])
+        return event.uuid, event.attributes[0].id
+
+    def _add_published_event_with_note(self, source_instance, name, note_distribution=None):
+        """
+        Create an event with a NOTE_TEXT note on the source instance, then publish it.
+        The note keeps the default distribution of the instance unless one is given. Returns the UUID of the event.
+        """
+        event = create_event(name)
+        event.distribution = 2
+        event = source_instance.add_event(event, pythonify=True)
+        check_response(event)
+        self.assertIsNotNone(event.id)
+        uuid = event.uuid
+        self._track(uuid)
+
+        # Add a note linked to the event
+        note = MISPNote()
+        note.object_type = 'Event'
+        note.object_uuid = uuid
+        note.note = NOTE_TEXT
+        if note_distribution is not None:
+            note.distribution = note_distribution
+        note = source_instance.add_note(note, pythonify=True)
+        self.assertEqual(note.object_uuid, uuid)
+        self.assertEqual(note.object_type, 'Event')
+        self.assertEqual(note.note, NOTE_TEXT)
 
-        # Publish the event and push to linked servers
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)
+        return uuid
+
+    def _add_published_cluster(self, source_instance, galaxy_name, description, cluster_value):
+        """
+        Create a galaxy and a cluster in it on the source instance, then publish the cluster.
+        Returns the galaxy and the UUID of the cluster.
+        """
+        new_galaxy = add_galaxy(source_instance, galaxy_name, 2, description)
+        new_galaxy_cluster = create_galaxy_cluster(cluster_value, 2, "A cluster description")
+        add_published_galaxy_clusters(source_instance, new_galaxy, [new_galaxy_cluster])
+        return new_galaxy, new_galaxy_cluster.uuid
+
+    @staticmethod
+    def _fetch_notes(target_instance, uuid):
+        """
+        Fetch the notes of the target instance until the note of the given event shows up.
+        """
+        # There is no Pymisp function allowing to fetch analyst data
+        return wait_for(lambda: target_instance._check_response(target_instance._prepare_request(
+            'GET',
+            '/analystData/index/Note'
+        )), lambda notes: has_note(notes, uuid, NOTE_TEXT))
+
+    def testSyncSightingsOnPush(self):
+        """
+        Checks that sightings are properly synchronized when an event is pushed.
+        """
+        # Use the first MISP instance as the source
+        source_instance = misps_org_admin[0]
 
-        # Get the server configurations linked to this instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
+        # Create an event whose first attribute carries a sighting, publish it and push to linked servers
+        uuid, attr_id = self._add_published_event_with_sighting(source_instance, 'Event for sightings sync on push')
+
+        # Check the server configurations linked to this instance
+        servers_id = self.servers_id
         if not servers_id:
             raise Exception("No server configuration found for the source instance")
 
-        # Push the event to each linked server (a push all is needed for sightings)
-        for server_id in servers_id:
-            push_response = misps_site_admin[0].server_push(server=server_id)
-            time.sleep(2)
-            check_response(push_response)
+        # Push to all linked servers at once (a push all is needed for sightings)
+        push_to_servers(misps_site_admin[0], servers_id)
 
         # Check for the presence of the sighting in the Sighting structure of each target instance
-        linked_server_numbers = extract_server_numbers(servers)
-        for target_index in linked_server_numbers:
-            target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid, include_sightings=True)
+        has_sighting = lambda results: bool(results) and find_sighting(results[0]['Event'], attr_id, SIGHTING_SOURCE) is not None
+        linked_server_numbers = self.linked_server_numbers
+        results_per_target = parallel_map(lambda target_index: wait_for(lambda: misps_org_admin[target_index - 1].search(uuid=uuid, include_sightings=True, limit=1), has_sighting), linked_server_numbers)
+        for target_index, search_results in zip(linked_server_numbers, results_per_target):
             self.assertGreater(len(search_results), 0, f"Event not found on MISP_{target_index} after push")
-            event_data = search_results[0]['Event']
-            found = False
-            for attr in event_data.get('Attribute', []):
-                if str(attr['id']) == str(attr_id) and 'Sighting' in attr:
-                    for s in attr['Sighting']:
-                        if s['source'] == 'SyncTest' and str(s['attribute_id']) == str(attr_id):
-                            found = True
-                            break
-                if found:
-                    break
+            found = has_sighting(search_results)
             self.assertTrue(found, f"Sighting not found in Attribute/Sighting on MISP_{target_index} after push")
 
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
 
     def testSyncSightingsOnPull(self):
         """
         Checks that sightings are properly synchronized when an event is pulled.
         """
         # Find a unidirectional link between two instances
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
         print(f"Unidirectional link: {source_index} --> {target_index}")
 
-        # Create an event and add an attribute
-        event = create_event('Event for sightings sync on pull')
-        event.distribution = 2
-        event = source_instance.add_event(event, pythonify=True)
-        check_response(event)
-        self.assertIsNotNone(event.id)
-        uuid = event.uuid
-
-        # Add a sighting to the first attribute
-        attr_id = event.attributes[0].id
-        sighting = MISPSighting()
-        sighting.value = event.attributes[0].value
-        sighting.source = 'SyncTest'
-        sighting.type = '0'
-        r = source_instance.add_sighting(sighting, event.attributes[0], pythonify=True)
-        self.assertEqual(r.source, 'SyncTest')
-
-        # Publish the event immediately
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)
+        # Create an event whose first attribute carries a sighting and publish it
+        uuid, attr_id = self._add_published_event_with_sighting(source_instance, 'Event for sightings sync on pull')
 
         # Perform the pull on the target instance (a pull all is needed for sightings)
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
-        time.sleep(2)  # Allow time for pull to complete
         check_response(pull_result)
 
         # Check for the presence of the sighting in the Sighting structure of the target instance
-        found = False
-        results = target_instance.search(uuid=uuid, include_sightings=True)
-        if results:
-            found = False
-            event_data = results[0]['Event']
-            for attr in event_data.get('Attribute', []):
-                if str(attr['id']) == str(attr_id) and 'Sighting' in attr:
-                    for s in attr['Sighting']:
-                        if s['source'] == 'SyncTest' and str(s['attribute_id']) == str(attr_id):
-                            found = True
-                            break
-                if found:
-                    break
+        has_sighting = lambda results: bool(results) and find_sighting(results[0]['Event'], attr_id, SIGHTING_SOURCE) is not None
+        results = wait_for(lambda: target_instance.search(uuid=uuid, include_sightings=True, limit=1), has_sighting)
+        found = has_sighting(results)
         self.assertTrue(found, f"Sighting not found in Attribute/Sighting on MISP_{target_index} after pull")
 
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
 
     def testSyncAnalystDataOnPush(self):
         """
@@ -131,120 +164,45 @@ class TestSyncMethodsEnabled(unittest.TestCase):
         # Use the first MISP instance as the source
         source_instance = misps_org_admin[0]
 
-        # Create an event and add a note as analyst data
-        event = create_event('Event for analyst data sync on push')
-        event.distribution = 2
-        event = source_instance.add_event(event, pythonify=True)
-        check_response(event)
-        self.assertIsNotNone(event.id)
-        uuid = event.uuid
-
-        # Add a note linked to the event
-        note = MISPNote()
-        note.object_type = 'Event'
-        note.object_uuid = uuid
-        note.note = 'Test analyst note'
-        note.distribution = 2
-        note = source_instance.add_note(note, pythonify=True)
-        self.assertEqual(note.object_uuid, uuid)
-        self.assertEqual(note.object_type, 'Event')
-        self.assertEqual(note.note, 'Test analyst note')
-
-        # Publish the event and push to linked servers
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)
+        # Create an event with a note as analyst data, publish it and push to linked servers
+        uuid = self._add_published_event_with_note(source_instance, 'Event for analyst data sync on push', note_distribution=2)
 
-        # Get the server configurations linked to this instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
+        # Check the server configurations linked to this instance
+        servers_id = self.servers_id
         if not servers_id:
             raise Exception("No server configuration found for the source instance")
 
-        # Push the event to each linked server (a push all is needed for analyst data)
-        for server_id in servers_id:
-            push_response = misps_site_admin[0].server_push(server=server_id)
-            time.sleep(2)
-            check_response(push_response)
-
-
+        # Push to all linked servers at once (a push all is needed for analyst data)
+        push_to_servers(misps_site_admin[0], servers_id)
 
         # Check if the analyst data is present in the target instance
-        linked_server_numbers = extract_server_numbers(servers)
-        for target_index in linked_server_numbers:
-            target_instance = misps_org_admin[target_index - 1]
-
-            # There is no Pymisp function allowing to fetch analyst data
-            search_results = target_instance._check_response(target_instance._prepare_request(
-                'GET',
-                '/analystData/index/Note'
-            ))
-            #print(search_results)
-            found = False
-            if search_results:
-                for note in search_results:
-                    if note['Note']['object_uuid'] == uuid and note['Note']['note'] == 'Test analyst note':
-                        found = True
-                        break
+        linked_server_numbers = self.linked_server_numbers
+        results_per_target = parallel_map(lambda target_index: self._fetch_notes(misps_org_admin[target_index - 1], uuid), linked_server_numbers)
+        for target_index, search_results in zip(linked_server_numbers, results_per_target):
+            found = has_note(search_results, uuid, NOTE_TEXT)
             self.assertTrue(found, f"Analyst note not found on MISP_{target_index} after push")
 
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
 
     def testSyncAnalystDataOnPull(self):
         """
         Checks that analyst data (notes) are properly synchronized when an event is pulled.
         """
         # Find a unidirectional link between two instances
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
         print(f"Unidirectional link: {source_index} --> {target_index}")
 
-        # Create an event and add a note as analyst data
-        event = create_event('Event for analyst data sync on pull')
-        event.distribution = 2
-        event = source_instance.add_event(event, pythonify=True)
-        check_response(event)
-        self.assertIsNotNone(event.id)
-        uuid = event.uuid
-
-        # Add a note linked to the event
-        note = MISPNote()
-        note.object_type = 'Event'
-        note.object_uuid = uuid
-        note.note = 'Test analyst note'
-        note = source_instance.add_note(note, pythonify=True)
-        self.assertEqual(note.object_uuid, uuid)
-        self.assertEqual(note.object_type, 'Event')
-        self.assertEqual(note.note, 'Test analyst note')
-
-        # Publish the event immediately
-        publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)
+        # Create an event with a note as analyst data and publish it
+        uuid = self._add_published_event_with_note(source_instance, 'Event for analyst data sync on pull')
 
         # Perform the pull on the target instance (pull all is needed for analyst data)
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
-        time.sleep(2)  # Allow time for pull to complete
         check_response(pull_result)
 
-        # There is no Pymisp function allowing to fetch analyst data
-        search_results = target_instance._check_response(target_instance._prepare_request(
-            'GET',
-            '/analystData/index/Note'
-        ))
-        #print(search_results)
-        found = False
-        if search_results:
-            for note in search_results:
-                if note['Note']['object_uuid'] == uuid and note['Note']['note'] == 'Test analyst note':
-                    found = True
-                    break
+        # Check if the analyst data is present in the target instance
+        search_results = self._fetch_notes(target_instance, uuid)
+        found = has_note(search_results, uuid, NOTE_TEXT)
         self.assertTrue(found, f"Analyst note not found on MISP_{target_index} after pull")
 
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
 
     def testSyncGalaxyClusterOnPush(self):
         """
@@ -253,50 +211,26 @@ class TestSyncMethodsEnabled(unittest.TestCase):
         # Use the first MISP instance as the source
         source_instance = misps_org_admin[0]
 
-        # Create a galaxy
-        source_instance._check_response(source_instance._prepare_request(
-            'POST',
-            '/galaxies/add',
-            data={
-                'name': 'Galaxy for Push',
-                'namespace': 'MISP Test',
-                'distribution': 2,
-                'description': 'testSyncGalaxyClusterOnPush'
-            }
-        ))
-        new_galaxy = source_instance.galaxies(pythonify=True)[-1]
-
-        # Create a galaxy cluster
-        new_uuid = str(UUID.uuid4())
-        new_galaxy_cluster: MISPGalaxyCluster = MISPGalaxyCluster()
-        new_galaxy_cluster.uuid = new_uuid
-        new_galaxy_cluster.value = "Cluster for Push"
-        new_galaxy_cluster.authors = ["CIRCL"]
-        new_galaxy_cluster.distribution = 2
-        new_galaxy_cluster.description = "A cluster description"
-        source_instance.add_galaxy_cluster(new_galaxy, new_galaxy_cluster, pythonify=True)
-
-        # Get the cluster ID
-        cluster_id = get_uuid_or_id_from_abstract_misp(new_galaxy_cluster)
-        print(f"Created cluster ID: {cluster_id}")
-
-        # Publish the galaxy cluster
-        source_instance.publish_galaxy_cluster(cluster_id)
-        time.sleep(2)
-
-        # Get the server configurations linked to this instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
+        # Create a galaxy and a galaxy cluster, then publish the cluster, which pushes it to the linked servers
+        new_galaxy, new_uuid = self._add_published_cluster(source_instance, 'Galaxy for Push', 'testSyncGalaxyClusterOnPush', "Cluster for Push")
+
+        # Check the server configurations linked to this instance
+        servers_id = self.servers_id
         if not servers_id:
             raise Exception("No server configuration found for the source instance")
 
         # Check for the presence of the galaxy cluster in all linked servers
-        linked_server_numbers = extract_server_numbers(servers)
-        for target_index in linked_server_numbers:
+        def fetch_galaxy_and_clusters(target_index):
             target_instance = misps_site_admin[target_index - 1]
-
-            # Fetch the galaxy on the target instance (with clusters included!)
-            last_galaxy = target_instance.get_galaxy(new_galaxy, withCluster=True, pythonify=True)
+            # Fetch the galaxy on the target instance once it has been synchronized, its clusters are searched below
+            last_galaxy = wait_for(lambda: target_instance.get_galaxy(new_galaxy, pythonify=True), is_found)
+            # Now fetch the clusters explicitly, until the new one is the last
+            clusters = wait_for(lambda: target_instance.search_galaxy_clusters(last_galaxy, pythonify=True),
+                                lambda clusters: isinstance(clusters, list) and bool(clusters) and clusters[-1].uuid == new_uuid)
+            return last_galaxy, clusters
+
+        linked_server_numbers = self.linked_server_numbers
+        for target_index, (last_galaxy, clusters) in zip(linked_server_numbers, parallel_map(fetch_galaxy_and_clusters, linked_server_numbers)):
             if last_galaxy:
                 self.assertEqual(
                     last_galaxy.uuid,
@@ -304,8 +238,6 @@ class TestSyncMethodsEnabled(unittest.TestCase):
                     f"Last galaxy on MISP_{target_index} is not the one we just published"
                 )
 
-            # Now fetch the clusters explicitly
-            clusters = target_instance.search_galaxy_clusters(last_galaxy, pythonify=True)
             if not clusters:
                 raise AssertionError(f"No clusters found in galaxy on MISP_{target_index}")
 
@@ -322,48 +254,18 @@ class TestSyncMethodsEnabled(unittest.TestCase):
         Checks that galaxy clusters are properly synchronized when pulled from the server index.
         """
         # Find a unidirectional link between two instances
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
         print(f"Unidirectional link: {source_index} --> {target_index}")
 
-        # Create a galaxy
-        source_instance._check_response(source_instance._prepare_request(
-            'POST',
-            '/galaxies/add',
-            data={
-                'name': 'Galaxy for Pull',
-                'namespace': 'MISP Test',
-                'distribution': 2,
-                'description': 'testSyncGalaxyClusterOnPull'
-            }
-        ))
-        new_galaxy = source_instance.galaxies(pythonify=True)[-1]
-
-        # Create a galaxy cluster
-        new_uuid = str(UUID.uuid4())
-        new_galaxy_cluster: MISPGalaxyCluster = MISPGalaxyCluster()
-        new_galaxy_cluster.uuid = new_uuid
-        new_galaxy_cluster.value = "Cluster for Pull"
-        new_galaxy_cluster.authors = ["CIRCL"]
-        new_galaxy_cluster.distribution = 2
-        new_galaxy_cluster.description = "A cluster description"
-        source_instance.add_galaxy_cluster(new_galaxy, new_galaxy_cluster, pythonify=True)
-
-        # Get the cluster ID
-        cluster_id = get_uuid_or_id_from_abstract_misp(new_galaxy_cluster)
-        print(f"Created cluster ID: {cluster_id}")
-
-        # Publish the galaxy cluster
-        source_instance.publish_galaxy_cluster(cluster_id)
-        time.sleep(2)
-
+        # Create a galaxy and a galaxy cluster, then publish the cluster
+        new_galaxy, new_uuid = self._add_published_cluster(source_instance, 'Galaxy for Pull', 'testSyncGalaxyClusterOnPull', "Cluster for Pull")
 
         # Perform the pull on the target instance
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
-        time.sleep(2)  # Allow time for pull to complete
         check_response(pull_result)
 
         # Check for the presence of the cluster
-        last_galaxy = target_instance.get_galaxy(new_galaxy, withCluster=True, pythonify=True)
+        last_galaxy = wait_for(lambda: target_instance.get_galaxy(new_galaxy, pythonify=True), is_found)
         if last_galaxy:
             self.assertEqual(
                 last_galaxy.uuid,
@@ -371,8 +273,9 @@ class TestSyncMethodsEnabled(unittest.TestCase):
                 f"Last galaxy on MISP_{target_index} is not the one we just published"
             )
 
-        # Now fetch the clusters explicitly
-        clusters = target_instance.search_galaxy_clusters(last_galaxy, pythonify=True)
+        # Now fetch the clusters explicitly, until the new one is the last
+        clusters = wait_for(lambda: target_instance.search_galaxy_clusters(last_galaxy, pythonify=True),
+                            lambda clusters: isinstance(clusters, list) and bool(clusters) and clusters[-1].uuid == new_uuid)
         if not clusters:
             raise AssertionError(f"No clusters found in galaxy on MISP_{target_index}")
 
@@ -1,10 +1,8 @@
-import unittest
-import time
-from common import misps_site_admin, misps_org_admin, create_event, publish_immediately, check_response, get_servers_id, extract_server_numbers, find_unidirectional_link, purge_events_and_blocklists
+from common import misps_site_admin, misps_org_admin, cached_servers, create_event, publish_immediately, check_response, servers_info, wait_for, has_attribute_value, has_proposal_value, has_deletion_proposal, SyncTestCase
 from pymisp import MISPAttribute
 
 
-class TestModifyAttribute(unittest.TestCase):
+class TestModifyAttribute(SyncTestCase):
     def testUpdatedAttributeOnPush(self):
         """
         Verifies that when an attribute is updated in the source instance,
@@ -24,28 +22,26 @@ class TestModifyAttribute(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Publish the event immediately to propagate changes
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Wait for synchronization to complete
 
         # Retrieve the server configurations linked to the source instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
+        servers = cached_servers(0)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id:
             raise Exception("No server configuration found for the source instance")
 
         # Push the event to each linked server before publication
         for server_id in servers_id:
             push_response = misps_site_admin[0].server_push(server=server_id, event=event.id)
-            time.sleep(2)  # Wait for the push operation to complete
             check_response(push_response)
 
         # Verify that the event is present on each target instance
-        linked_server_numbers = extract_server_numbers(servers)
         for target_index in linked_server_numbers:
             target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
+            search_results = wait_for(lambda: target_instance.search(uuid=uuid, limit=1))
             self.assertGreater(
                 len(search_results), 0,
                 f"Event not found on MISP_{target_index} after push"
@@ -58,28 +54,17 @@ class TestModifyAttribute(unittest.TestCase):
 
         # Publish the event again to propagate the updated attribute
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Wait for synchronization to complete
 
         # Verify that the updated attribute is present on each target instance
+        has_updated_value = lambda results: bool(results) and has_attribute_value(results[0]['Event'], 'updated_value')
         for target_index in linked_server_numbers:
             target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
+            search_results = wait_for(lambda: target_instance.search(uuid=uuid, limit=1), has_updated_value)
             self.assertGreater(
                 len(search_results), 0,
                 f"Event not found on MISP_{target_index} after attribute update"
             )
-            for result in search_results:
-                attributes = result['Event']['Attribute']
-                found = False
-                for attr in attributes:
-                    if attr['value'] == 'updated_value':
-                        found = True
-                        break
-                self.assertTrue(found, f"Updated attribute not found on MISP_{target_index}")
-
-        # Cleanup: delete all test events and blocklists on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
+            self.assertTrue(has_updated_value(search_results), f"Updated attribute not found on MISP_{target_index}")
 
 
     def testUpdatedAttributeOnPull(self):
@@ -89,7 +74,7 @@ class TestModifyAttribute(unittest.TestCase):
         The event should be pulled from the source instance with the updated attribute value.
         """
         # Find a unidirectional link between two instances
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
         print(f"Unidirectional link: {source_index} --> {target_index}")
 
         # Create a new event on the source instance
@@ -103,31 +88,19 @@ class TestModifyAttribute(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Publish the event immediately
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Wait for synchronization to complete
 
         # Perform the pull operation on the target instance
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id, event=event.id)
-        time.sleep(2)  # Wait for the pull operation to complete
         check_response(pull_result)
 
         # Confirm that the event exists on the target instance
-        found = False
-        results = target_instance.search(uuid=uuid)
-        if results:
-            found = True
-            for result in results:
-                attributes = result['Event']['Attribute']
-                found_attr = False
-                for attr in attributes:
-                    if attr['value'] == 'initial_value':
-                        found_attr = True
-                        break
-                self.assertTrue(found_attr, f"Initial attribute not found on MISP_{target_index}")
-
-        self.assertTrue(found, f"Event not found on MISP_{target_index} after pull")
+        results = wait_for(lambda: target_instance.search(uuid=uuid, limit=1))
+        self.assertGreater(len(results), 0, f"Event not found on MISP_{target_index} after pull")
+        self.assertTrue(has_attribute_value(results[0]['Event'], 'initial_value'), f"Initial attribute not found on MISP_{target_index}")
 
         # Update the attribute value on the source instance
         attribute.value = 'updated_value'
@@ -136,32 +109,16 @@ class TestModifyAttribute(unittest.TestCase):
 
         # Publish the updated event immediately
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Wait for synchronization to complete
 
         # Perform the pull operation again to get the updated attribute
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id, event=event.id)
-        time.sleep(2)  # Wait for the pull operation to complete
         check_response(pull_result)
 
         # Confirm that the updated attribute exists on the target instance
-        results = target_instance.search(uuid=uuid)
-        found = False
-        if results:
-            found = True
-            for result in results:
-                attributes = result['Event']['Attribute']
-                found_attr = False
-                for attr in attributes:
-                    if attr['value'] == 'updated_value':
-                        found_attr = True
-                        break
-                self.assertTrue(found_attr, f"Updated attribute not found on MISP_{target_index}")
-
-        self.assertTrue(found, f"Event not found on MISP_{target_index} after pull with updated attribute")
-
-        # Cleanup: delete all test events and blocklists on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
+        has_updated_value = lambda results: bool(results) and has_attribute_value(results[0]['Event'], 'updated_value')
+        results = wait_for(lambda: target_instance.search(uuid=uuid, limit=1), has_updated_value)
+        self.assertGreater(len(results), 0, f"Event not found on MISP_{target_index} after pull with updated attribute")
+        self.assertTrue(has_updated_value(results), f"Updated attribute not found on MISP_{target_index}")
 
 
     def testSoftDeleteAttributeOnPush(self):
@@ -183,22 +140,21 @@ class TestModifyAttribute(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Publish the event immediately
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Wait for synchronization to complete
 
         # Retrieve the server configurations linked to the source instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
+        servers = cached_servers(0)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id:
             raise Exception("No server configuration found for the source instance")
 
         # Verify that the event is present on each target instance
-        linked_server_numbers = extract_server_numbers(servers)
         for target_index in linked_server_numbers:
             target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
+            search_results = wait_for(lambda: target_instance.search(uuid=uuid, limit=1))
             self.assertGreater(
                 len(search_results), 0,
                 f"Event not found on MISP_{target_index} after push"
@@ -211,28 +167,17 @@ class TestModifyAttribute(unittest.TestCase):
 
         # Publish the event again to propagate the soft-deleted attribute
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)
 
-        # Verify that the soft-deleted attribute is present on each target instance
+        # Verify that the soft-deleted attribute is present on each target instance (site admin required to search deleted attributes)
+        has_deleted_value = lambda results: bool(results) and has_attribute_value(results[0]['Event'], 'Gotta be deleted', deleted=True)
         for target_index in linked_server_numbers:
-            target_instance = misps_org_admin[target_index - 1]
-            search_results = misps_site_admin[target_index - 1].search(uuid=uuid, deleted=True)
+            target_site_admin = misps_site_admin[target_index - 1]
+            search_results = wait_for(lambda: target_site_admin.search(uuid=uuid, deleted=True, limit=1), has_deleted_value)
             self.assertGreater(
                 len(search_results), 0,
                 f"Event not found on MISP_{target_index} after attribute soft delete"
             )
-            for result in search_results:
-                attributes = result['Event']['Attribute']
-                found = False
-                for attr in attributes:
-                    if attr['value'] == 'Gotta be deleted' and attr['deleted'] is True:
-                        found = True
-                        break
-                self.assertTrue(found, f"Soft-deleted attribute not found on MISP_{target_index}")
-
-        # Cleanup: delete all test events and blocklists on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
+            self.assertTrue(has_deleted_value(search_results), f"Soft-deleted attribute not found on MISP_{target_index}")
 
 
     def testSoftDeleteAttributeOnPull(self):
@@ -242,7 +187,7 @@ class TestModifyAttribute(unittest.TestCase):
         The event should be pulled from the source instance with the soft-deleted attribute.
         """
         # Find a unidirectional link between two instances
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
         print(f"Unidirectional link: {source_index} --> {target_index}")
 
         # Create a new event on the source instance
@@ -256,31 +201,19 @@ class TestModifyAttribute(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Publish the event immediately
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Wait for synchronization to complete 
 
         # Perform the pull operation on the target instance
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id, event=event.id)
-        time.sleep(2)
         check_response(pull_result)
 
         # Confirm that the event exists on the target instance
-        found = False
-        results = target_instance.search(uuid=uuid)
-        if results:
-            found = True
-            for result in results:
-                attributes = result['Event']['Attribute']
-                found_attr = False
-                for attr in attributes:
-                    if attr['value'] == 'Gotta be deleted':
-                        found_attr = True
-                        break
-                self.assertTrue(found_attr, f"Initial attribute not found on MISP_{target_index}")
-
-        self.assertTrue(found, f"Event not found on MISP_{target_index} after pull")
+        results = wait_for(lambda: target_instance.search(uuid=uuid, limit=1))
+        self.assertGreater(len(results), 0, f"Event not found on MISP_{target_index} after pull")
+        self.assertTrue(has_attribute_value(results[0]['Event'], 'Gotta be deleted'), f"Initial attribute not found on MISP_{target_index}")
 
         # Soft delete the attribute on the source instance
         attribute.delete()
@@ -289,32 +222,16 @@ class TestModifyAttribute(unittest.TestCase):
 
         # Publish the updated event immediately
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Wait for synchronization to complete
 
         # Perform the pull operation again to get the soft-deleted attribute
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id, event=event.id)
-        time.sleep(2)  # Wait for the pull operation to complete
         check_response(pull_result)
 
         # Confirm that the soft-deleted attribute exists on the target instance
-        results = misps_site_admin[target_index - 1].search(uuid=uuid, deleted=True) # Site admin required to search deleted attributes
-        found = False
-        if results:
-            found = True
-            for result in results:
-                attributes = result['Event']['Attribute']
-                found_attr = False
-                for attr in attributes:
-                    if attr['value'] == 'Gotta be deleted' and attr['deleted'] is True:
-                        found_attr = True
-                        break
-                self.assertTrue(found_attr, f"Soft-deleted attribute not found on MISP_{target_index}")
-
-        self.assertTrue(found, f"Event not found on MISP_{target_index} after pull with soft-deleted attribute")
-
-        # Cleanup: delete all test events and blocklists on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
+        has_deleted_value = lambda results: bool(results) and has_attribute_value(results[0]['Event'], 'Gotta be deleted', deleted=True)
+        results = wait_for(lambda: misps_site_admin[target_index - 1].search(uuid=uuid, deleted=True, limit=1), has_deleted_value) # Site admin required to search deleted attributes
+        self.assertGreater(len(results), 0, f"Event not found on MISP_{target_index} after pull with soft-deleted attribute")
+        self.assertTrue(has_deleted_value(results), f"Soft-deleted attribute not found on MISP_{target_index}")
 
 
     def testUpdatedProposalAttributeOnPush(self):
@@ -333,6 +250,7 @@ class TestModifyAttribute(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Add a new attribute to the event
         new_attribute = MISPAttribute()
@@ -356,37 +274,28 @@ class TestModifyAttribute(unittest.TestCase):
 
         # Publish the event immediately
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Wait for synchronization to complete
 
         # Retrieve the server configurations linked to the source instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
+        servers = cached_servers(0)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id:
             raise Exception("No server configuration found for the source instance")
 
         # Perform the push operation on all linked servers (proposals are not shared with a single publication)
         for server_id in servers_id:
             push_response = misps_site_admin[0].server_push(server=server_id, event=event.id)
-            time.sleep(2)  # Wait for the push operation to complete
             check_response(push_response)
 
         # Verify that the event is present on each target instance with the proposal attribute
-        linked_server_numbers = extract_server_numbers(servers)
+        has_proposal = lambda results: bool(results) and has_proposal_value(results[0]['Event'], 'Doe')
         for target_index in linked_server_numbers:
             target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
+            search_results = wait_for(lambda: target_instance.search(uuid=uuid, limit=1), has_proposal)
             self.assertGreater(
                 len(search_results), 0,
                 f"Event not found on MISP_{target_index} after push"
             )
-            for result in search_results:
-                proposal = result['Event']['ShadowAttribute']
-                found_proposal = False
-                for prop in proposal:
-                    if prop['value'] == 'Doe':
-                        found_proposal = True
-                        break
-                self.assertTrue(found_proposal, f"Proposal attribute not found on MISP_{target_index}")
+            self.assertTrue(has_proposal(search_results), f"Proposal attribute not found on MISP_{target_index}")
 
         # Accept the first proposal and reject the second one
         #print(f"UUID of the proposal: {first_new_proposal}")
@@ -397,37 +306,23 @@ class TestModifyAttribute(unittest.TestCase):
 
         # Publish the event immediately
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)
 
         # Perform the push operation again to propagate the updated proposals
         for server_id in servers_id:
             push_response = source_instance.server_push(server=server_id)
-            time.sleep(2)  # Wait for the push operation to complete
             check_response(push_response)
 
         # Verify that the first proposal is present as an attribute on each target instance and the second proposal is not present
+        has_accepted = lambda results: bool(results) and has_attribute_value(results[0]['Event'], 'Doe')
         for target_index in linked_server_numbers:
             target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
+            search_results = wait_for(lambda: target_instance.search(uuid=uuid, limit=1), has_accepted)
             self.assertGreater(
                 len(search_results), 0,
                 f"Event not found on MISP_{target_index} after proposal update"
             )
-            for result in search_results:
-                attributes = result['Event']['Attribute']
-                found_first_proposal = False
-                found_second_proposal = False
-                for attr in attributes:
-                    if attr['value'] == 'Doe':
-                        found_first_proposal = True
-                    if attr['value'] == 'Dope':
-                        found_second_proposal = True
-                self.assertTrue(found_first_proposal, f"Accepted proposal not found on MISP_{target_index}")
-                self.assertFalse(found_second_proposal, f"Discarded proposal found on MISP_{target_index}")
-
-        # Cleanup: delete all test events and blocklists on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
+            self.assertTrue(has_accepted(search_results), f"Accepted proposal not found on MISP_{target_index}")
+            self.assertFalse(has_attribute_value(search_results[0]['Event'], 'Dope'), f"Discarded proposal found on MISP_{target_index}")
 
 
 
@@ -438,7 +333,7 @@ class TestModifyAttribute(unittest.TestCase):
         The event should be pulled from the source instance with the updated proposal attribute.
         """
         # Find a unidirectional link between two instances
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
         print(f"Unidirectional link: {source_index} --> {target_index}")
 
         # Create a new event on the source instance
@@ -449,6 +344,7 @@ class TestModifyAttribute(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Add a new attribute to the event
         new_attribute = MISPAttribute()
@@ -470,28 +366,16 @@ class TestModifyAttribute(unittest.TestCase):
 
         # Publish the event immediately
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Wait for synchronization to complete
 
         # Perform the pull operation on the target instance
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
-        time.sleep(2) # Wait for the pull operation to complete
         check_response(pull_result)
 
         # Confirm that the event exists on the target instance with the proposal attribute
-        found = False
-        results = target_instance.search(uuid=uuid)
-        if results:
-            found = True
-            for result in results:
-                proposal = result['Event']['ShadowAttribute']
-                found_proposal = False
-                for prop in proposal:
-                    if prop['value'] == 'Doe':
-                        found_proposal = True
-                        break
-                self.assertTrue(found_proposal, f"Proposal attribute not found on MISP_{target_index}")
-
-        self.assertTrue(found, f"Event not found on MISP_{target_index} after pull")
+        has_proposal = lambda results: bool(results) and has_proposal_value(results[0]['Event'], 'Doe')
+        results = wait_for(lambda: target_instance.search(uuid=uuid, limit=1), has_proposal)
+        self.assertGreater(len(results), 0, f"Event not found on MISP_{target_index} after pull")
+        self.assertTrue(has_proposal(results), f"Proposal attribute not found on MISP_{target_index}")
 
         # Accept the first proposal and reject the second one
         response = source_instance.accept_attribute_proposal(first_new_proposal)
@@ -501,33 +385,17 @@ class TestModifyAttribute(unittest.TestCase):
 
         # Publish the event immediately
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)
 
         # Perform the pull operation again to propagate the updated proposals
         pull_result = target_instance.server_pull(server=server_id)
-        time.sleep(2)  # Wait for the pull operation to complete
         check_response(pull_result)
 
         # Verify that the first proposal is present as an attribute on the target instance and the second proposal is not present
-        results = target_instance.search(uuid=uuid)
-        found = False
-        if results:
-            found = True
-            for result in results:
-                attributes = result['Event']['Attribute']
-                found_first_proposal = False
-                found_second_proposal = False
-                for attr in attributes:
-                    if attr['value'] == 'Doe':
-                        found_first_proposal = True
-                    if attr['value'] == 'Dope':
-                        found_second_proposal = True
-                self.assertTrue(found_first_proposal, f"Accepted proposal not found on MISP_{target_index}")
-                self.assertFalse(found_second_proposal, f"Discarded proposal found on MISP_{target_index}")
-
-        # Cleanup: delete all test events and blocklists on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
+        has_accepted = lambda results: bool(results) and has_attribute_value(results[0]['Event'], 'Doe')
+        results = wait_for(lambda: target_instance.search(uuid=uuid, limit=1), has_accepted)
+        self.assertGreater(len(results), 0, f"Event not found on MISP_{target_index} after pull with updated proposals")
+        self.assertTrue(has_accepted(results), f"Accepted proposal not found on MISP_{target_index}")
+        self.assertFalse(has_attribute_value(results[0]['Event'], 'Dope'), f"Discarded proposal found on MISP_{target_index}")
 
 
     def testDeletedProposalAttributeOnPush(self):
@@ -546,6 +414,7 @@ class TestModifyAttribute(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Add a new attribute to the event
         new_attribute = MISPAttribute()
@@ -559,43 +428,28 @@ class TestModifyAttribute(unittest.TestCase):
 
         # Publish the event immediately
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Wait for synchronization to complete
 
         # Retrieve the server configurations linked to the source instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
+        servers = cached_servers(0)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id:
             raise Exception("No server configuration found for the source instance")
 
         # Perform the push operation on all linked servers (proposals are not shared with a single publication)
         for server_id in servers_id:
             push_response = misps_site_admin[0].server_push(server=server_id)
-            time.sleep(2)  # Wait for the push operation to complete
             check_response(push_response)
 
         # Verify that the event is present on each target instance with the proposal attribute
-        linked_server_numbers = extract_server_numbers(servers)
+        has_proposal = lambda results: bool(results) and has_deletion_proposal(results[0]['Event'], 'John')
         for target_index in linked_server_numbers:
             target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
+            search_results = wait_for(lambda: target_instance.search(uuid=uuid, limit=1), has_proposal)
             self.assertGreater(
                 len(search_results), 0,
                 f"Event not found on MISP_{target_index} after push"
             )
-            for result in search_results:
-                attributes = result['Event']['Attribute']
-                found_proposal = False
-                for attr in attributes:
-                    if attr['value'] == 'John':
-                        for prop in attr['ShadowAttribute']:
-                            if prop['proposal_to_delete'] is True:
-                                found_proposal = True
-                                break
-                self.assertTrue(found_proposal, f"Proposal attribute not found on MISP_{target_index}")
-
-        # Cleanup: delete all test events and blocklists on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
+            self.assertTrue(has_proposal(search_results), f"Proposal attribute not found on MISP_{target_index}")
 
 
     def testDeletedProposalAttributeOnPull(self):
@@ -605,7 +459,7 @@ class TestModifyAttribute(unittest.TestCase):
         The event should be pulled from the source instance with the deleted proposal attribute.
         """
         # Find a unidirectional link between two instances
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
         print(f"Unidirectional link: {source_index} --> {target_index}")
 
         # Create a new event on the source instance
@@ -616,6 +470,7 @@ class TestModifyAttribute(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Add a new attribute to the event
         new_attribute = MISPAttribute()
@@ -629,32 +484,14 @@ class TestModifyAttribute(unittest.TestCase):
 
         # Publish the event immediately
         publish_immediately(source_instance, event, with_email=False)
-        time.sleep(2)  # Wait for synchronization to complete
 
         # Perform the pull operation on the target instance
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id)
-        time.sleep(2)  # Wait for the pull operation to complete
         check_response(pull_result)
 
         # Confirm that the event exists on the target instance with the proposal attribute
-        found = False
-        results = target_instance.search(uuid=uuid)
-        if results:
-            found = True
-            for result in results:
-                attributes = result['Event']['Attribute']
-                found_proposal = False
-                for attr in attributes:
-                    if attr['value'] == 'John':
-                        for prop in attr['ShadowAttribute']:
-                            if prop['proposal_to_delete'] is True:
-                                found_proposal = True
-                                break
-                self.assertTrue(found_proposal, f"Proposal attribute not found on MISP_{target_index}")
-
-        self.assertTrue(found, f"Event not found on MISP_{target_index} after pull")
-
-        # Cleanup: delete all test events and blocklists on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
+        has_proposal = lambda results: bool(results) and has_deletion_proposal(results[0]['Event'], 'John')
+        results = wait_for(lambda: target_instance.search(uuid=uuid, limit=1), has_proposal)
+        self.assertGreater(len(results), 0, f"Event not found on MISP_{target_index} after pull")
+        self.assertTrue(has_proposal(results), f"Proposal attribute not found on MISP_{target_index}")
 
@@ -1,8 +1,7 @@
-import unittest
 import time
-from common import misps_site_admin, misps_org_admin, create_event, publish_immediately, check_response, get_servers_id, extract_server_numbers, find_unidirectional_link, purge_events_and_blocklists
+from common import misps_site_admin, misps_org_admin, cached_servers, create_event, publish_immediately, check_response, servers_info, SyncTestCase
 
-class TestModifyEvent(unittest.TestCase):
+class TestModifyEvent(SyncTestCase):
     def testUpdatedEventnOnPush(self):
         """
         Test that an updated event is correctly propagated to the target instances via push synchronization.
@@ -20,6 +19,7 @@ class TestModifyEvent(unittest.TestCase):
         # Add the event to the source instance
         event = source_instance.add_event(event, pythonify=True)
         uuid = event.uuid
+        self._track(uuid)
         check_response(event)
         self.assertIsNotNone(event.id)
 
@@ -28,16 +28,15 @@ class TestModifyEvent(unittest.TestCase):
         time.sleep(2)
 
         # Retrieve the server configurations linked to the source instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
+        servers = cached_servers(0)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id:
             raise Exception("No server configuration found for the source instance")
 
         # Verify that the event is present on all target instances with the initial info
-        linked_server_numbers = extract_server_numbers(servers)
         for target_index in linked_server_numbers:
             target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
+            search_results = target_instance.search(uuid=uuid, limit=1)
             self.assertGreater(
                 len(search_results), 0,
                 f"Event not found on MISP_{target_index} after publication"
@@ -66,7 +65,7 @@ class TestModifyEvent(unittest.TestCase):
         # Confirm that the updated event exists on each linked server with the new info
         for target_index in linked_server_numbers:
             target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
+            search_results = target_instance.search(uuid=uuid, limit=1)
             self.assertGreater(
                 len(search_results), 0,
                 f"Event not found on MISP_{target_index} after publication"
@@ -77,10 +76,6 @@ class TestModifyEvent(unittest.TestCase):
                     f"Updated event info mismatch on MISP_{target_index}"
                 )
 
-        # Cleanup: delete all test events and blocklists from all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
     def testUpdatedEventOnPull(self):
         """
         Test that an updated event is correctly pulled from the source instance to the target instances via pull synchronization.
@@ -89,7 +84,7 @@ class TestModifyEvent(unittest.TestCase):
         Finally, it cleans up all test events and blocklists from all instances.
         """
         # Find a unidirectional link between two instances
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
         print(f"Unidirectional link: {source_index} --> {target_index}")
 
         # Create an event on the source instance with a specific name
@@ -102,6 +97,7 @@ class TestModifyEvent(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Publish the event immediately (without sending email notifications)
         publish_immediately(source_instance, event, with_email=False)
@@ -114,7 +110,7 @@ class TestModifyEvent(unittest.TestCase):
 
         # Confirm that the event exists on the target instance with the correct info
         found = False
-        results = target_instance.search(uuid=uuid)
+        results = target_instance.search(uuid=uuid, limit=1)
 
         if results:
             found = True
@@ -141,7 +137,7 @@ class TestModifyEvent(unittest.TestCase):
         check_response(pull_result)
 
         # Confirm that the updated event exists on the target instance with the new info
-        results = target_instance.search(uuid=uuid)
+        results = target_instance.search(uuid=uuid, limit=1)
         found = False
 
         if results:
@@ -153,7 +149,3 @@ class TestModifyEvent(unittest.TestCase):
                 )
 
         self.assertTrue(found, f"Updated event not found on MISP_{target_index} after pull")
-
-        # Cleanup: delete all test events and blocklists from all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
\ No newline at end of file
@@ -1,9 +1,8 @@
-import unittest
 import time
-from common import misps_site_admin, misps_org_admin, create_event, publish_immediately, check_response, get_servers_id, extract_server_numbers, find_unidirectional_link, purge_events_and_blocklists
+from common import misps_site_admin, misps_org_admin, cached_servers, create_event, publish_immediately, check_response, servers_info, SyncTestCase
 
 
-class TestPublicationState(unittest.TestCase):
+class TestPublicationState(SyncTestCase):
     def testPublicationOnPush(self):
         """
         Explicitly tests that an event is correctly pushed to linked MISP instances only after it is published on the source instance.
@@ -25,12 +24,13 @@ class TestPublicationState(unittest.TestCase):
 
         event = source_instance.add_event(event, pythonify=True)
         uuid = event.uuid
+        self._track(uuid)
         check_response(event)
         self.assertIsNotNone(event.id)
 
         # Get the server configurations linked to this instance
-        servers = misps_site_admin[0].servers()
-        servers_id = get_servers_id(servers)
+        servers = cached_servers(0)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id:
             raise Exception("No server configuration found for the source instance")
 
@@ -40,10 +40,9 @@ class TestPublicationState(unittest.TestCase):
             check_response(push_response)
 
         # Verify that the event is NOT yet present on the targets
-        linked_server_numbers = extract_server_numbers(servers)
         for target_index in linked_server_numbers:
             target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
+            search_results = target_instance.search(uuid=uuid, limit=1)
             self.assertEqual(
                 len(search_results), 0,
                 f"Event unexpectedly found on MISP_{target_index} before publication"
@@ -62,16 +61,12 @@ class TestPublicationState(unittest.TestCase):
         # Confirm the event now exists on each linked server
         for target_index in linked_server_numbers:
             target_instance = misps_org_admin[target_index - 1]
-            search_results = target_instance.search(uuid=uuid)
+            search_results = target_instance.search(uuid=uuid, limit=1)
             self.assertGreater(
                 len(search_results), 0,
                 f"Event not found on MISP_{target_index} after publication"
             )
 
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
     def testPublicationOnPull(self):
         """
         Explicitly tests that an event is correctly pulled on a unidirectional (pull-only) link between two MISP instances, and only after publication.
@@ -84,7 +79,7 @@ class TestPublicationState(unittest.TestCase):
         5. Pull events again on the target instance and verify the event is now present.
         6. Cleanup all test events and blocklists from all instances.
         """
-        source_instance, target_instance, source_index, target_index, server_id = find_unidirectional_link()
+        source_instance, target_instance, source_index, target_index, server_id = self._pull_link()
         print(f"Pulling from MISP_{source_index} on MISP_{target_index}")
 
         # Create and publish an event on the source
@@ -96,6 +91,7 @@ class TestPublicationState(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Perform the pull on the target
         pull_result = misps_site_admin[target_index - 1].server_pull(server=server_id) # Do not specify event ID because it will pull events that are not published yet
@@ -104,7 +100,7 @@ class TestPublicationState(unittest.TestCase):
 
         # Confirm the event doesn't exist on the target
         found = False
-        results = target_instance.search(uuid=uuid)
+        results = target_instance.search(uuid=uuid, limit=1)
         if results:
             found = True
 
@@ -119,12 +115,8 @@ class TestPublicationState(unittest.TestCase):
         time.sleep(2)  # Allow time for pull to complete
 
         # Confirm the event now exists on the target
-        results = target_instance.search(uuid=uuid)
+        results = target_instance.search(uuid=uuid, limit=1)
         if results:
             found = True
 
         self.assertTrue(found, f"Event not found on MISP_{target_index} after pull and publication.")
-
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
\ No newline at end of file
@@ -1,8 +1,7 @@
-import unittest
 import time
-from common import misps_site_admin, misps_org_admin, create_event, publish_immediately, check_response, get_servers_id, extract_server_numbers, find_unidirectional_link, purge_events_and_blocklists
+from common import misps_site_admin, misps_org_admin, cached_servers, create_event, publish_immediately, check_response, get_servers_id, extract_server_numbers, SyncTestCase
 
-class TestSyncSharingGroups(unittest.TestCase):
+class TestSyncSharingGroups(SyncTestCase):
     def testSharingGroupsOnPush(self):
         """
         Creates an event on the first instance with distribution set to 'Sharing Group',
@@ -33,13 +32,14 @@ class TestSyncSharingGroups(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid_event = event.uuid
+        self._track(uuid_event)
 
         # Publish the event
         publish_immediately(source_instance, event, with_email=False)
         time.sleep(2)
 
         # Push to all linked servers (to force synchronization)
-        servers = misps_site_admin[0].servers()
+        servers = cached_servers(0)
         servers_id = get_servers_id(servers)
         for server_id in servers_id:
             push_response = misps_site_admin[0].server_push(server=server_id, event=event.id)
@@ -47,14 +47,10 @@ class TestSyncSharingGroups(unittest.TestCase):
             check_response(push_response)
 
         # The event must be present on the first server
-        results_target = misps_site_admin[0].search(uuid=uuid_event)
+        results_target = misps_site_admin[0].search(uuid=uuid_event, limit=1)
         self.assertGreater(len(results_target), 0, "The event is not present on the first server while it should be.")
 
         # The event must NOT be present on the other instances
         for idx, instance in enumerate(other_instances, start=3):
-            results = instance.search(uuid=uuid_event)
+            results = instance.search(uuid=uuid_event, limit=1)
             self.assertEqual(len(results), 0, f"The event should not be present on server {idx}.")
-
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
@@ -1,11 +1,10 @@
-import unittest
 import time
-from common import misps_site_admin, misps_org_admin, create_event, publish_immediately, check_response, get_servers_id, extract_server_numbers, purge_events_and_blocklists
+from common import misps_site_admin, misps_org_admin, cached_servers, create_event, publish_immediately, check_response, get_servers_id, extract_server_numbers, server_number_to_id, SyncTestCase
 
 
 
 
-class TestSyncForAllServers(unittest.TestCase):
+class TestSyncForAllServers(SyncTestCase):
     def testPushForAllServers(self):
         """
         Verifies that events pushed from each MISP instance are correctly propagated to all linked servers.
@@ -16,7 +15,7 @@ class TestSyncForAllServers(unittest.TestCase):
         internal_instances = misps_org_admin[-2:]  # The two internal MISP instances
         for i, source_instance in enumerate(misps_org_admin):
             # Get the list of servers configured on this instance
-            linked_servers = extract_server_numbers(misps_site_admin[i].servers())
+            linked_servers = extract_server_numbers(cached_servers(i))
 
             # Create a new event with unique info
             event = create_event(f'Push Test Event {misps_org_admin.index(source_instance) + 1}')
@@ -28,6 +27,7 @@ class TestSyncForAllServers(unittest.TestCase):
             check_response(event)
             self.assertIsNotNone(event.id)
             uuid = event.uuid
+            self._track(uuid)
 
             # Publish immediately to trigger push sync
             publish_immediately(source_instance, event, with_email=False)
@@ -36,7 +36,7 @@ class TestSyncForAllServers(unittest.TestCase):
             # Verify event presence on expected instances
             for target_instance in misps_org_admin:
                 target_index = misps_org_admin.index(target_instance) + 1
-                found_events = target_instance.search(uuid=uuid)
+                found_events = target_instance.search(uuid=uuid, limit=1)
                 if target_instance == source_instance or target_index in linked_servers:
                     # Should exist on source and linked servers
                     self.assertGreater(len(found_events), 0,
@@ -47,10 +47,6 @@ class TestSyncForAllServers(unittest.TestCase):
                         self.assertEqual(len(found_events), 0,
                             f"Event found on MISP {target_index} but should NOT be present.")
 
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
     def testPullForAllServers(self):
         """
         Verifies that events can be pulled from a source MISP instance to a target instance via unidirectional sync.
@@ -61,12 +57,12 @@ class TestSyncForAllServers(unittest.TestCase):
         """
         for i, source_instance in enumerate(misps_org_admin):
             source_index = i + 1
-            source_links = extract_server_numbers(misps_site_admin[i].servers())
+            source_links = extract_server_numbers(cached_servers(i))
 
             for j, target_index in enumerate(source_links):
                 # Get the target instance based on the index
                 target_instance = misps_org_admin[target_index - 1]
-                target_links = extract_server_numbers(misps_site_admin[target_index - 1].servers())
+                target_links = extract_server_numbers(cached_servers(target_index - 1))
 
                 # Skip bidirectional sync to keep this test unidirectional only
                 if source_index in target_links:
@@ -86,13 +82,8 @@ class TestSyncForAllServers(unittest.TestCase):
                     print(f"Inverted direction: {source_index} --> {target_index}")
 
                 # Find the server ID on the target that links to the source
-                target_servers = misps_site_admin[target_index - 1].servers()
-                server_id = None
-                for server in target_servers:
-                    name = server['Server']['name']
-                    if str(source_index) in name:
-                        server_id = server['Server']['id']
-                        break
+                target_servers = cached_servers(target_index - 1)
+                server_id = server_number_to_id(target_servers).get(source_index)
 
                 if server_id is None:
                     raise Exception(f"No server config on MISP_{target_index} pointing to MISP_{source_index}")
@@ -108,6 +99,7 @@ class TestSyncForAllServers(unittest.TestCase):
                 check_response(event)
                 self.assertIsNotNone(event.id)
                 uuid = event.uuid
+                self._track(uuid)
 
                 publish_immediately(source_instance, event)
                 time.sleep(2)  # Give time for publish propagation
@@ -119,13 +111,9 @@ class TestSyncForAllServers(unittest.TestCase):
 
                 # Confirm the event exists on the target
                 found = False
-                results = target_instance.search(uuid=uuid)
+                results = target_instance.search(uuid=uuid, limit=1)
                 if results:
                     found = True
                     break
 
                 self.assertTrue(found, f"Event not found on MISP_{target_index} after pull")
-
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
\ No newline at end of file
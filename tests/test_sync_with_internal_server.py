@@ -1,10 +1,9 @@
-import unittest
 import time
 import uuid as UUID
-from common import misps_site_admin, misps_org_admin, create_event, publish_immediately, check_response, get_servers_id, extract_server_numbers, purge_events_and_blocklists
+from common import misps_site_admin, misps_org_admin, cached_servers, create_event, publish_immediately, check_response, get_servers_id, purge_events_and_blocklists, servers_info, SyncTestCase
 from pymisp import MISPTag, MISPGalaxy, MISPGalaxyCluster
 
-class TestSyncWithInternalServer(unittest.TestCase):
+class TestSyncWithInternalServer(SyncTestCase):
     def testLocalShareAndDowngradeOnPush(self):
         """
         Creates an event with distribution level 0 on the last instance in the topology,
@@ -16,9 +15,8 @@ class TestSyncWithInternalServer(unittest.TestCase):
         source_index = len(misps_org_admin)
 
         # Get the servers linked to this instance
-        servers = misps_site_admin[-1].servers()
-        servers_id = get_servers_id(servers)
-        linked_server_numbers = extract_server_numbers(servers)
+        servers = cached_servers(-1)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id or not linked_server_numbers:
             self.skipTest("No linked server found for the last instance.")
 
@@ -35,6 +33,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
             check_response(event)
             self.assertIsNotNone(event.id)
             uuid = event.uuid
+            self._track(uuid)
 
             # Publish the event immediately
             publish_immediately(source_instance, event, with_email=False)
@@ -46,7 +45,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
             check_response(push_result)
 
             # Check that the event is present on the target server with the same distribution level
-            results = target_instance.search(uuid=uuid)
+            results = target_instance.search(uuid=uuid, limit=1)
             self.assertGreater(len(results), 0, f"Event not found on target server MISP_{target_index} after push (dist={dist_level})")
             for result in results:
                 self.assertEqual(
@@ -54,10 +53,6 @@ class TestSyncWithInternalServer(unittest.TestCase):
                     f"Incorrect distribution on MISP_{target_index} (expected {dist_level}, got {result['Event']['distribution']})"
                 )
 
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
     def testLocalShareAndDowngradeOnPull(self):
         """
         Creates events with different distribution levels on the last instance in the topology.
@@ -69,16 +64,15 @@ class TestSyncWithInternalServer(unittest.TestCase):
         source_index = len(misps_org_admin)
 
         # Get the servers linked to this instance
-        servers = misps_site_admin[-1].servers()
-        servers_id = get_servers_id(servers)
-        linked_server_numbers = extract_server_numbers(servers)
+        servers = cached_servers(-1)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id or not linked_server_numbers:
             self.skipTest("No linked server found for the last instance.")
 
         # Use the first linked server as the target
         target_index = linked_server_numbers[0]
         target_instance = misps_org_admin[target_index - 1]
-        server_id = get_servers_id(misps_site_admin[target_index - 1].servers())[0]
+        server_id = get_servers_id(cached_servers(target_index - 1))[0]
 
         # Expected mapping of distribution levels after pull
         expected_distribution_after_pull = {
@@ -98,6 +92,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
             check_response(event)
             self.assertIsNotNone(event.id)
             uuid = event.uuid
+            self._track(uuid)
 
             # Publish the event
             publish_immediately(source_instance, event, with_email=False)
@@ -112,7 +107,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
             check_response(pull_result)
 
             # Search for the event on the target
-            results = misps_site_admin[target_index - 1].search(uuid=uuid)
+            results = misps_site_admin[target_index - 1].search(uuid=uuid, limit=1)
             self.assertGreater(len(results), 0, f"Event not found on MISP_{target_index} after pull")
 
             # Check that the distribution was correctly applied
@@ -124,10 +119,6 @@ class TestSyncWithInternalServer(unittest.TestCase):
                     f"Incorrect distribution on MISP_{target_index}: expected {expected_distribution}, got {actual_distribution} (source={dist_level})"
                 )
 
-            # Cleanup: delete all test events on all instances
-            for instance in misps_site_admin:
-                purge_events_and_blocklists(instance)
-
 
     def testLockedFlagOnPush(self):
         """
@@ -139,9 +130,8 @@ class TestSyncWithInternalServer(unittest.TestCase):
         source_instance = misps_org_admin[-1]
 
         # Get the servers linked to this instance
-        servers = misps_site_admin[-1].servers()
-        servers_id = get_servers_id(servers)
-        linked_server_numbers = extract_server_numbers(servers)
+        servers = cached_servers(-1)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id or not linked_server_numbers:
             self.skipTest("No linked server found for the last instance.")
 
@@ -156,6 +146,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Check that the event is unlocked on the source
         event_on_source = source_instance.get_event(event.id, pythonify=True)
@@ -169,7 +160,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
         time.sleep(2)
 
         # Check that the event is present on the target server with locked=True
-        results = target_instance.search(uuid=uuid)
+        results = target_instance.search(uuid=uuid, limit=1)
         self.assertGreater(len(results), 0, f"Event not found on target server MISP_{target_index} after push")
         for result in results:
             self.assertTrue(
@@ -177,10 +168,6 @@ class TestSyncWithInternalServer(unittest.TestCase):
                 f"Incorrect locked flag on MISP_{target_index} (expected True, got {result['Event'].get('locked')})"
             )
 
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
 
     def testLockedFlagOnPull(self):
         """
@@ -193,16 +180,15 @@ class TestSyncWithInternalServer(unittest.TestCase):
         source_index = len(misps_org_admin)
 
         # Get the servers linked to this instance
-        servers = misps_site_admin[-1].servers()
-        servers_id = get_servers_id(servers)
-        linked_server_numbers = extract_server_numbers(servers)
+        servers = cached_servers(-1)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id or not linked_server_numbers:
             self.skipTest("No linked server found for the last instance.")
 
         # Use the first linked server as the target
         target_index = linked_server_numbers[0]
         target_instance = misps_org_admin[target_index - 1]
-        server_id = get_servers_id(misps_site_admin[target_index - 1].servers())[0]
+        server_id = get_servers_id(cached_servers(target_index - 1))[0]
 
         # Create an event (locked=False by default)
         event = create_event('Event for locked flag on pull')
@@ -211,6 +197,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Check that the event is unlocked on the source
         event_on_source = source_instance.get_event(event.id, pythonify=True)
@@ -229,7 +216,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
         check_response(pull_result)
 
         # Check that the event is present on the target server with locked=True
-        results = target_instance.search(uuid=uuid)
+        results = target_instance.search(uuid=uuid, limit=1)
         self.assertGreater(len(results), 0, f"Event not found on target server MISP_{target_index} after pull")
         for result in results:
             self.assertTrue(
@@ -237,10 +224,6 @@ class TestSyncWithInternalServer(unittest.TestCase):
                 f"Incorrect locked flag on MISP_{target_index} (expected True, got {result['Event'].get('locked')})"
             )
 
-        # Cleanup: delete all test events on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
 
     def testLocalTagPropagationOnPush(self):
         """
@@ -251,9 +234,8 @@ class TestSyncWithInternalServer(unittest.TestCase):
         source_index = len(misps_org_admin)
 
         # Get the servers linked to this instance
-        servers = misps_site_admin[-1].servers()
-        servers_id = get_servers_id(servers)
-        linked_server_numbers = extract_server_numbers(servers)
+        servers = cached_servers(-1)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id or not linked_server_numbers:
             self.skipTest("No linked server found for the last instance.")
 
@@ -268,6 +250,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Create tags
         local_tag = MISPTag()
@@ -290,7 +273,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
         time.sleep(2)
 
         # Check on the target server
-        results = target_instance.search(uuid=uuid)
+        results = target_instance.search(uuid=uuid, limit=1)
         self.assertGreater(len(results), 0, f"The event was not found on MISP_{target_index} after the push.")
 
         for result in results:
@@ -301,10 +284,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
             self.assertTrue(found_global_tag, f"Global tag not found on MISP_{target_index}")
             self.assertTrue(found_local_tag, f"Local tag not found on MISP_{target_index}")
 
-        # Cleanup: delete events and tags on all relevant instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
+        # Cleanup: delete the tags created by the test
         misps_site_admin[-1].delete_tag(new_local_tag)
         misps_site_admin[-1].delete_tag(new_global_tag)
 
@@ -319,16 +299,15 @@ class TestSyncWithInternalServer(unittest.TestCase):
         source_index = len(misps_org_admin)
 
         # Get the servers linked to this instance
-        servers = misps_site_admin[-1].servers()
-        servers_id = get_servers_id(servers)
-        linked_server_numbers = extract_server_numbers(servers)
+        servers = cached_servers(-1)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id or not linked_server_numbers:
             self.skipTest("No linked server found for the last instance.")
 
         # Use the first linked server as the target
         target_index = linked_server_numbers[0]
         target_instance = misps_org_admin[target_index - 1]
-        server_id = get_servers_id(misps_site_admin[target_index - 1].servers())[0]
+        server_id = get_servers_id(cached_servers(target_index - 1))[0]
 
         # Create the event
         event_name = f"Event {source_index} with a local tag for pull on {target_index}"
@@ -338,6 +317,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         # Create tags
         local_tag = MISPTag()
@@ -366,7 +346,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
         check_response(pull_result)
 
         # Check for the presence of tags on the target
-        results = target_instance.search(uuid=uuid)
+        results = target_instance.search(uuid=uuid, limit=1)
         self.assertGreater(len(results), 0, f"Event not found on MISP_{target_index}")
 
         for result in results:
@@ -377,10 +357,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
             self.assertTrue(found_global_tag, f"Global tag not found on MISP_{target_index}")
             self.assertTrue(found_local_tag, f"Local tag not found on MISP_{target_index}")
 
-        # Cleanup: delete all test events and tags on all instances
-        for instance in misps_site_admin:
-            purge_events_and_blocklists(instance)
-
+        # Cleanup: delete the tags created by the test
         source_instance.delete_tag(new_local_tag)
         source_instance.delete_tag(new_global_tag)
 
@@ -396,9 +373,8 @@ class TestSyncWithInternalServer(unittest.TestCase):
         source_index = len(misps_org_admin)
 
         # Get the servers linked to this instance
-        servers = misps_site_admin[-1].servers()
-        servers_id = get_servers_id(servers)
-        linked_server_numbers = extract_server_numbers(servers)
+        servers = cached_servers(-1)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id or not linked_server_numbers:
             self.skipTest("No linked server found for the last instance.")
 
@@ -413,6 +389,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         #Create a galaxy (not implemented in PyMisp)
         source_instance._check_response(source_instance._prepare_request(
@@ -458,7 +435,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
         time.sleep(2)
 
         # Check on the target server
-        results = target_instance.search(uuid=uuid)
+        results = target_instance.search(uuid=uuid, limit=1)
         self.assertGreater(len(results), 0, f"The event was not found on MISP_{target_index} after the push.")
 
         for result in results:
@@ -473,10 +450,6 @@ class TestSyncWithInternalServer(unittest.TestCase):
                     break
             self.assertTrue(found, f"Local cluster {cluster.uuid} not found on MISP_{target_index}")
 
-        # Cleanup: delete all test events on all instances
-        for instance in misps_org_admin:
-            purge_events_and_blocklists(instance)
-
 
 
 
@@ -490,15 +463,14 @@ class TestSyncWithInternalServer(unittest.TestCase):
         source_index = len(misps_org_admin)
 
         # Get the servers linked to this instance
-        servers = misps_site_admin[-1].servers()
-        servers_id = get_servers_id(servers)
-        linked_server_numbers = extract_server_numbers(servers)
+        servers = cached_servers(-1)
+        servers_id, linked_server_numbers = servers_info(servers)
         if not servers_id or not linked_server_numbers:
             self.skipTest("No linked server found for the last instance.")
 
         target_index = linked_server_numbers[0]
         target_instance = misps_org_admin[target_index - 1]
-        server_id = get_servers_id(misps_site_admin[target_index - 1].servers())[0]
+        server_id = get_servers_id(cached_servers(target_index - 1))[0]
 
         # Create the event
         event = create_event("Event with local Galaxy Cluster (pull)")
@@ -507,6 +479,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
         check_response(event)
         self.assertIsNotNone(event.id)
         uuid = event.uuid
+        self._track(uuid)
 
         #Create a galaxy (not implemented in PyMisp)
         source_instance._check_response(source_instance._prepare_request(
@@ -558,7 +531,7 @@ class TestSyncWithInternalServer(unittest.TestCase):
         check_response(pull_result)
 
         # Check
-        results = target_instance.search(uuid=uuid)
+        results = target_instance.search(uuid=uuid, limit=1)
         self.assertGreater(len(results), 0, f"Event not found on MISP_{target_index}")
 
         for result in results:
@@ -573,7 +546,5 @@ class TestSyncWithInternalServer(unittest.TestCase):
                     break
             self.assertTrue(found, f"Local cluster {cluster.uuid} not found on MISP_{target_index}")
 
-        # Cleanup: delete all test events on all instances
-        for instance in misps_org_admin:
-           purge_events_and_blocklists(instance)
+        # Cleanup: delete the galaxy cluster created by the test
         misps_site_admin[-1].delete_galaxy_cluster(cluster.uuid)